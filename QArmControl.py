@@ -1,15 +1,349 @@
-import time
+import queue, threading, time
+from collections import deque, namedtuple
+from concurrent.futures import Future
 import numpy as np
 from quanser.p_QArm import QArm, QArmUtilities
 
+# Momentaufnahme der Roboterpose: Gelenkstellung, Greiferpose (4x4, aus der Vorwärtskinematik),
+# daraus vorberechnete Transformation Kamera -> Basis und Zeitpunkt des Auslesens
+ArmPose = namedtuple("ArmPose", ["joint_pos", "H_gripper2base", "H_cam2base", "timestamp"])
+
+# Messwert des Telemetrie-Threads: Gelenkstellung und -geschwindigkeit, Greiferposition (Vorwärtskinematik), Zeitpunkt
+ArmSample = namedtuple("ArmSample", ["joint_pos", "joint_speed", "position", "timestamp"])
+
+
+class SettleDetector:
+    """
+    Erkennt, wann der Arm nach einem Fahrbefehl angekommen und zur Ruhe gekommen ist.
+
+    Ein Messwert gilt als "eingeschwungen", wenn der Positionsfehler (kartesisch und, falls bekannt, je Gelenk)
+    und die Gelenkgeschwindigkeiten unter den Schwellwerten liegen. Die Ankunft wird gemeldet, sobald dieser Zustand
+    `settle_time` Sekunden anhält. Hysterese: ein laufendes Einschwingen wird erst verworfen, wenn ein Wert die
+    Schwelle um den Faktor `hysteresis` überschreitet (Messrauschen setzt die Zeit nicht zurück).
+    """
+    def __init__(self, position_threshold=0.05, joint_threshold=0.05, velocity_threshold=0.02,
+                 settle_time=0.1, hysteresis=1.5, start_grace=0.2):
+        """
+        Args:
+            position_threshold (float): Maximaler Abstand der Greiferposition zum Ziel (m).
+            joint_threshold (float): Maximale Abweichung je Gelenk zum Sollwert (rad), falls dieser bekannt ist.
+            velocity_threshold (float): Maximale Gelenkgeschwindigkeit (rad/s).
+            settle_time (float): Dauer (s), die alle Werte innerhalb der Schwellen bleiben müssen.
+            hysteresis (float): Faktor auf die Schwellen, ab dem ein laufendes Einschwingen verworfen wird.
+            start_grace (float): Messwerte, die jünger als der Fahrbefehl + start_grace sind, werden ignoriert
+                                 (der Arm hat die Bewegung dann evtl. noch nicht begonnen).
+        """
+        self.position_threshold = position_threshold
+        self.joint_threshold = joint_threshold
+        self.velocity_threshold = velocity_threshold
+        self.settle_time = settle_time
+        self.hysteresis = hysteresis
+        self.start_grace = start_grace
+
+    def errors(self, sample, dest, joint_target=None):
+        """
+        Normierte Abweichungen eines Messwerts (1.0 = genau auf der Schwelle).
+
+        Returns:
+            float: Größter Wert aus Positions-, Gelenk- und Geschwindigkeitsfehler relativ zur jeweiligen Schwelle.
+        """
+        ratios = [np.linalg.norm(sample.position - dest, ord=2) / self.position_threshold,
+                  np.max(np.abs(sample.joint_speed[:4])) / self.velocity_threshold]
+        if joint_target is not None:
+            ratios.append(np.max(np.abs(sample.joint_pos[:4] - joint_target[:4])) / self.joint_threshold)
+        return max(ratios)
+
+    def update(self, state, sample, dest, joint_target=None):
+        """
+        Wertet einen neuen Messwert aus.
+
+        Args:
+            state (dict): Zustand der aktuellen Bewegung (command_time, settling_since), wird angepasst.
+            sample (ArmSample): Neuer Messwert.
+            dest (np.ndarray): Zielposition des Greifers [x, y, z].
+            joint_target (np.ndarray, optional): Soll-Gelenkstellung.
+
+        Returns:
+            bool: True, sobald der Arm angekommen und eingeschwungen ist.
+        """
+        if sample.timestamp < state["command_time"] + self.start_grace:
+            return False
+        ratio = self.errors(sample, dest, joint_target)
+        state["last_ratio"] = ratio
+        if state["settling_since"] is None:
+            if ratio <= 1.0:
+                state["settling_since"] = sample.timestamp
+                if state["in_band_at"] is None:
+                    state["in_band_at"] = sample.timestamp
+        elif ratio > self.hysteresis:
+            state["settling_since"] = None
+        return state["settling_since"] is not None and sample.timestamp - state["settling_since"] >= self.settle_time
+
 class QArmControl:
     """
     Diese Klasse verwaltet die Steuerung des Quanser QArm-Roboters.
     Sie ermöglicht Bewegungen, Statusabfragen, Greifsteuerung und Koordinatentransformationen.
+
+    Alle Zugriffe auf den Arm laufen über einen einzigen Motion-Executor-Thread mit Befehlswarteschlange:
+    - go_to_async(), go_to_joint_async(), gripper_async() und submit() reihen einen Befehl ein und liefern
+      sofort ein Future (done(), result(), exception()); aufeinanderfolgende Befehle werden ohne Pause abgearbeitet.
+    - go_to(), go_to_joint(), gripper() usw. warten wie bisher auf das Ende der Bewegung, laufen aber ebenfalls
+      über die Warteschlange, sodass gleichzeitige Dash-Callbacks den Arm nie parallel ansteuern.
+    - run_sequence() führt einen ganzen Ablauf (Scan, Pick & Place) als einen Befehl aus; solange er läuft,
+      meldet is_busy() True und einzelne Befehle aus der Oberfläche werden abgelehnt statt zwischengeschoben.
+    - validate_target()/validate_joint_target() prüfen Grenzen und Inverse Kinematik sofort im Aufrufer,
+      damit die Oberfläche unerreichbare Ziele melden kann, bevor ein Befehl eingereiht wird.
     """
 
     def __init__(self):
         self.my_arm = None
+        self.commands = queue.Queue() # (Future, Funktion, args, kwargs)
+        self.executor_thread = None
+        self.executor_lock = threading.Lock()
+        self.sequences = 0 # eingereihte oder laufende Abläufe (run_sequence)
+
+        # Telemetrie: ein Thread liest den Arm mit fester Rate aus, wait_until_arrived() wartet auf neue Messwerte
+        self.hw_lock = threading.Lock() # read_std/read_write_std nie gleichzeitig aus mehreren Threads
+        self.telemetry_rate = 50 # Hz
+        self.telemetry_condition = threading.Condition()
+        self.telemetry_thread = None
+        self.telemetry_stop = threading.Event()
+        self.latest_sample = None
+        self.settle_detector = SettleDetector()
+        self.move_metrics = deque(maxlen=100) # Laufzeiten der letzten Bewegungen (siehe wait_until_arrived)
+
+    # ---------------------------------------- Motion-Executor ----------------------------------------
+    def _ensure_executor(self):
+        """Startet den Executor-Thread, falls er nicht bereits läuft."""
+        with self.executor_lock:
+            if self.executor_thread is None or not self.executor_thread.is_alive():
+                self.executor_thread = threading.Thread(target=self._run_executor, name="qarm-executor", daemon=True)
+                self.executor_thread.start()
+
+    def _run_executor(self):
+        """Arbeitet die Befehle in Eingangsreihenfolge ab; nur dieser Thread spricht mit der Hardware."""
+        while True:
+            future, fn, args, kwargs = self.commands.get()
+            if not future.set_running_or_notify_cancel():
+                continue # Befehl wurde vorher verworfen
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def in_executor(self):
+        """Gibt an, ob der Aufruf bereits im Executor-Thread läuft (z.B. innerhalb eines mit submit() eingereihten Ablaufs)."""
+        return threading.current_thread() is self.executor_thread
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Reiht eine beliebige Funktion in die Befehlswarteschlange ein (z.B. eine Folge von Bewegungen).
+        Innerhalb der Funktion können die blockierenden Methoden (go_to, gripper, ...) direkt genutzt werden.
+
+        Args:
+            fn (callable): Auszuführende Funktion.
+
+        Returns:
+            concurrent.futures.Future: Ergebnis bzw. Fehler der Funktion (Fehler werden zusätzlich ausgegeben,
+            da das Ergebnis aus UI-Callbacks meist niemand abfragt).
+        """
+        future = self._enqueue(fn, *args, **kwargs)
+        future.add_done_callback(self._log_failure)
+        return future
+
+    def _enqueue(self, fn, *args, **kwargs):
+        """Reiht einen Befehl ein, dessen Ergebnis (inkl. Fehler) der Aufrufer selbst abfragt."""
+        future = Future()
+        self._ensure_executor()
+        self.commands.put((future, fn, args, kwargs))
+        return future
+
+    def _call(self, fn, *args, **kwargs):
+        """Führt einen Befehl über den Executor aus und wartet auf sein Ende (direkt, falls bereits im Executor)."""
+        if self.in_executor():
+            return fn(*args, **kwargs)
+        return self._enqueue(fn, *args, **kwargs).result()
+
+    @staticmethod
+    def _log_failure(future):
+        """Gibt Fehler von Befehlen aus, deren Ergebnis niemand abfragt (submit() und *_async() aus UI-Callbacks)."""
+        if not future.cancelled() and future.exception() is not None:
+            print(f"[FEHLER] Roboterbefehl fehlgeschlagen: {future.exception()}")
+
+    def cancel_pending(self):
+        """
+        Verwirft alle noch nicht begonnenen Befehle (die laufende Bewegung wird zu Ende geführt).
+
+        Returns:
+            int: Anzahl verworfener Befehle.
+        """
+        cancelled = 0
+        while True:
+            try:
+                future, _, _, _ = self.commands.get_nowait()
+            except queue.Empty:
+                return cancelled
+            if future.cancel():
+                cancelled += 1
+
+    def run_sequence(self, fn, *args, **kwargs):
+        """
+        Führt einen ganzen Ablauf als einen Executor-Befehl aus und wartet auf sein Ende.
+        Einzelbefehle anderer Callbacks können so nicht zwischen zwei Bewegungen des Ablaufs laufen.
+
+        Args:
+            fn (callable): Ablauf (nutzt die blockierenden Methoden go_to, gripper, ...).
+
+        Returns:
+            Rückgabewert von `fn`.
+        """
+        if self.in_executor():
+            return fn(*args, **kwargs)
+        with self.executor_lock:
+            self.sequences += 1
+        try:
+            return self._enqueue(fn, *args, **kwargs).result()
+        finally:
+            with self.executor_lock:
+                self.sequences -= 1
+
+    def is_busy(self):
+        """Gibt an, ob gerade ein Ablauf (Scan, Pick & Place) eingereiht ist oder läuft."""
+        with self.executor_lock:
+            return self.sequences > 0
+
+    def validate_target(self, coord, rotation=0):
+        """
+        Prüft ein kartesisches Ziel (Basis-, Boden- und Gelenkgrenzen über die Inverse Kinematik).
+
+        Args:
+            coord (list oder str): Zielkoordinaten [x, y, z] oder "home".
+            rotation (float, optional): Rotation des Greifers in Grad.
+
+        Returns:
+            np.ndarray: Soll-Gelenkstellung (4 Gelenke, rad).
+
+        Raises:
+            BaseLimitError, BoxLimitError, JointLimitError: Wenn das Ziel nicht angefahren werden darf.
+        """
+        if isinstance(coord, str) and coord == "home":
+            return np.zeros(4)
+        phi, _ = self._read_state()
+        self.check_base_limits(coord)
+        self.check_box_limits(coord)
+        _, phi_cmd = self.myArmUtilities.qarm_inverse_kinematics(coord, 0, phi[:4])
+        phi_cmd[3] = np.radians(rotation)
+        self.check_joint_limits(phi_cmd)
+        return phi_cmd
+
+    def validate_joint_target(self, phi):
+        """
+        Prüft eine Soll-Gelenkstellung (Gelenkgrenzen und resultierende Greiferposition).
+
+        Returns:
+            np.ndarray: Greiferposition [x, y, z] der Gelenkstellung.
+
+        Raises:
+            BaseLimitError, BoxLimitError, JointLimitError: Wenn die Stellung nicht angefahren werden darf.
+        """
+        _,_,_,_,coord, _ = self.myArmUtilities.qarm_forward_kinematics(phi[:4])
+        self.check_base_limits(coord)
+        self.check_box_limits(coord)
+        self.check_joint_limits(phi[:4])
+        return coord
+
+    def pending_commands(self):
+        """Anzahl wartender Befehle (ohne den laufenden)."""
+        return self.commands.qsize()
+
+    # ---------------------------------------- Telemetrie ----------------------------------------
+    def _read_state(self):
+        """Liest Gelenkstellung und -geschwindigkeit einmalig aus (gegen parallele Hardwarezugriffe gesperrt)."""
+        with self.hw_lock:
+            self.my_arm.read_std()
+            return np.copy(self.my_arm.measJointPosition), np.copy(self.my_arm.measJointSpeed)
+
+    def _write(self, phi_cmd, grp_cmd):
+        """Sendet einen Fahr-/Greiferbefehl (gegen parallele Hardwarezugriffe gesperrt)."""
+        with self.hw_lock:
+            self.my_arm.read_write_std(phiCMD=phi_cmd, grpCMD=grp_cmd)
+
+    def _ensure_telemetry(self):
+        """Startet den Telemetrie-Thread, falls er nicht bereits läuft."""
+        with self.telemetry_condition:
+            if self.telemetry_thread is None or not self.telemetry_thread.is_alive():
+                self.telemetry_stop.clear()
+                self.telemetry_thread = threading.Thread(target=self._run_telemetry, name="qarm-telemetry", daemon=True)
+                self.telemetry_thread.start()
+
+    def _run_telemetry(self, max_failures=10):
+        """
+        Liest den Arm mit `telemetry_rate` Hz aus und benachrichtigt wartende Bewegungen.
+        Endet ohne Verbindung oder nach `max_failures` Lesefehlern in Folge (z.B. Arm getrennt);
+        die nächste Bewegung startet den Thread bei Bedarf neu.
+        """
+        period = 1.0 / self.telemetry_rate
+        next_time = time.perf_counter()
+        failures = 0
+        while self.my_arm is not None and not self.telemetry_stop.is_set():
+            try:
+                joint_pos, joint_speed = self._read_state()
+                _,_,_,_,position, _ = self.myArmUtilities.qarm_forward_kinematics(joint_pos[:4])
+                sample = ArmSample(joint_pos, joint_speed, np.asarray(position).flatten(), time.time())
+                with self.telemetry_condition:
+                    self.latest_sample = sample
+                    self.telemetry_condition.notify_all()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                if failures == 1:
+                    print(f"[FEHLER] Telemetrie des Roboters fehlgeschlagen: {e}")
+                if failures >= max_failures:
+                    print(f"[FEHLER] Telemetrie nach {failures} Fehlern in Folge beendet (Roboter getrennt?).")
+                    break
+                time.sleep(0.5)
+            next_time += period
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_time = time.perf_counter() # Rückstand nicht nachholen
+        with self.telemetry_condition:
+            self.telemetry_thread = None
+            self.telemetry_condition.notify_all()
+
+    def wait_for_sample(self, after=0.0, timeout=1.0):
+        """
+        Wartet auf einen Telemetrie-Messwert, der nach dem Zeitpunkt `after` aufgenommen wurde.
+
+        Returns:
+            ArmSample | None: Messwert oder None bei Zeitüberschreitung.
+        """
+        self._ensure_telemetry()
+        deadline = time.time() + timeout
+        with self.telemetry_condition:
+            while self.latest_sample is None or self.latest_sample.timestamp <= after:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+                self.telemetry_condition.wait(remaining)
+            return self.latest_sample
+
+    def go_to_async(self, coord, rotation=0):
+        """Wie go_to(), kehrt aber sofort zurück. Returns: Future."""
+        return self.submit(self._go_to, coord, rotation)
+
+    def go_to_joint_async(self, phi):
+        """Wie go_to_joint(), kehrt aber sofort zurück. Returns: Future."""
+        return self.submit(self._go_to_joint, phi)
+
+    def gripper_async(self, cmd):
+        """Wie gripper(), kehrt aber sofort zurück. Returns: Future."""
+        return self.submit(self._gripper, cmd)
+
+    def led_async(self, baseLED):
+        """Wie LED_Control(), wird aber erst nach den zuvor eingereihten Bewegungen ausgeführt. Returns: Future."""
+        return self.submit(self._led_control, baseLED)
 
     def connect(self):
         """
@@ -33,6 +367,9 @@ class QArmControl:
             # Geschätzte Hand-Augen-Kalibrierung (Transformation zwischen Kamera und Greifer)
             self.R_cam2gripper = [[0,-1,0],[1,0,0],[0,0,1]]
             self.t_cam2gripper = np.array([[0.058],[-0.038],[-0.2]])
+            self.H_cam2gripper = np.eye(4)
+            self.H_cam2gripper[:3, :3] = self.R_cam2gripper
+            self.H_cam2gripper[:3, 3] = self.t_cam2gripper.flatten()
             print(f"[INFO] Kalibrierdaten geladen: R = {self.R_cam2gripper}, t = {self.t_cam2gripper}")
 
             self.my_arm.read_std() # aktuelle Robo-Pos
@@ -118,118 +455,205 @@ class QArmControl:
             coord (list oder str): Zielkoordinaten [x, y, z] oder "home" für die Startposition.
             rotation (float, optional): Rotation des Greifers in Grad. Standardwert: 0.
         """
-        self.my_arm.read_std()
-        phi = self.my_arm.measJointPosition
+        return self._call(self._go_to, coord, rotation)
+
+    def _go_to(self, coord, rotation=0):
+        phi, _ = self._read_state()
+        phi_cmd = self.validate_target(coord, rotation)
         if isinstance(coord, str) and coord == "home":
             print(f"Go to Home Position")
-            self.my_arm.read_write_std(phiCMD=[0,0,0,0], grpCMD=phi[4])
-            self.wait_until_arrived([4.500000e-01, 3.061617e-18, 4.900000e-01])
+            self._write(phi_cmd, phi[4])
+            self.wait_until_arrived([4.500000e-01, 3.061617e-18, 4.900000e-01], joint_target=phi_cmd)
         else:
-            if self.check_base_limits(coord) and self.check_box_limits(coord):
-                _, phi_cmd = self.myArmUtilities.qarm_inverse_kinematics(coord, 0, phi[:4])
-                phi_cmd[3] = np.radians(rotation)
-                if self.check_joint_limits(phi_cmd):
-                    print(f"Go to Coordinates: {coord}, set Motor-Positions: {np.degrees(phi_cmd)}")
-                    self.my_arm.read_write_std(phiCMD=phi_cmd, grpCMD=phi[4])
-                    self.wait_until_arrived(coord)
+            print(f"Go to Coordinates: {coord}, set Motor-Positions: {np.degrees(phi_cmd)}")
+            self._write(phi_cmd, phi[4])
+            self.wait_until_arrived(coord, joint_target=phi_cmd)
 
     def go_to_joint(self, phi):
-        self.my_arm.read_std()
-        phi_old = self.my_arm.measJointPosition
-        _,_,_,_,coord, _ = self.myArmUtilities.qarm_forward_kinematics(phi[:4])
-        if self.check_base_limits(coord) and self.check_box_limits(coord) and self.check_joint_limits(phi):
-            print(f"Go to Coordinates: {coord}, set Motor-Positions: {np.degrees(phi)}")
-            self.my_arm.read_write_std(phiCMD=phi, grpCMD=phi_old[4])
-            self.wait_until_arrived(coord)
+        return self._call(self._go_to_joint, phi)
+
+    def _go_to_joint(self, phi):
+        phi_old, _ = self._read_state()
+        coord = self.validate_joint_target(phi)
+        print(f"Go to Coordinates: {coord}, set Motor-Positions: {np.degrees(phi)}")
+        self._write(phi, phi_old[4])
+        self.wait_until_arrived(coord, joint_target=phi)
             
     def gripper(self, cmd):
-        self.my_arm.read_std()
-        phi = self.my_arm.measJointPosition
-        self.my_arm.read_write_std(phiCMD = phi[:4], grpCMD=cmd)
-        time.sleep(1)
+        return self._call(self._gripper, cmd)
+
+    def _gripper(self, cmd):
+        phi, _ = self._read_state()
+        self._write(phi[:4], cmd)
+        position = self.wait_until_gripper_settled()
         if(cmd):
-            print(f"Gripper closed. POS {phi[4]}")
+            print(f"Gripper closed. POS {position}")
         else:
-            print(f"Gripper opened. POS: {phi[4]}")
+            print(f"Gripper opened. POS: {position}")
+
+    def wait_until_gripper_settled(self, timeout_duration=3.0, position_threshold=0.002, settle_time=0.15, start_grace=0.3):
+        """
+        Wartet über die Telemetrie, bis der Greifer zur Ruhe gekommen ist (ersetzt das feste Warten von 1 s).
+        Der Greifer gilt als eingeschwungen, wenn sich seine Position `settle_time` Sekunden lang um höchstens
+        `position_threshold` ändert; beim Greifen eines Objekts ist das der Fall, sobald er am Objekt anliegt.
+
+        Args:
+            timeout_duration (float): Maximale Wartezeit in Sekunden (danach Warnung, kein Abbruch).
+            position_threshold (float): Erlaubte Positionsänderung innerhalb des Ruhefensters.
+            settle_time (float): Dauer des Ruhefensters in Sekunden.
+            start_grace (float): Mindestwartezeit nach dem Befehl (Anlaufen des Greifers).
 
-    def wait_until_arrived(self, dest, timeout_duration = 10, threshold= 0.05):
+        Returns:
+            float: Greiferposition nach dem Einschwingen.
+        """
+        start_time = time.time()
+        window_start = None # (Zeitpunkt, Position) zu Beginn des Ruhefensters
+        sample, samples = None, 0
+        while True:
+            remaining = start_time + timeout_duration - time.time()
+            new_sample = self.wait_for_sample(after=sample.timestamp if sample else 0.0, timeout=max(remaining, 0.0))
+            if new_sample is None:
+                print(f"[WARNUNG] Greifer nach {timeout_duration} s nicht zur Ruhe gekommen.")
+                break
+            sample = new_sample
+            samples += 1
+            if sample.timestamp < start_time + start_grace:
+                continue
+            position = float(sample.joint_pos[4])
+            if window_start is None or abs(position - window_start[1]) > position_threshold:
+                window_start = (sample.timestamp, position)
+            elif sample.timestamp - window_start[0] >= settle_time:
+                break
+
+        position = float(sample.joint_pos[4]) if sample is not None else None
+        self.move_metrics.append({
+            "target": "gripper",
+            "duration": round((sample.timestamp if sample else time.time()) - start_time, 3),
+            "settle": round(sample.timestamp - window_start[0], 3) if sample is not None and window_start else None,
+            "error": None,
+            "samples": samples
+        })
+        return position
+
+    def wait_until_arrived(self, dest, timeout_duration = 10, threshold= 0.05, joint_target=None):
+        """
+        Wartet ereignisgesteuert auf die Messwerte des Telemetrie-Threads, bis der SettleDetector die Ankunft meldet
+        (kein festes Warten, kein aktives Abfragen). Die Laufzeit der Bewegung wird in `move_metrics` abgelegt.
+
+        Args:
+            dest (list): Zielposition des Greifers [x, y, z].
+            timeout_duration (float): Maximale Dauer der Bewegung in Sekunden.
+            threshold (float): Maximaler Abstand zum Ziel (m).
+            joint_target (array, optional): Soll-Gelenkstellung (rad), zusätzlich zur Position geprüft.
+
+        Raises:
+            TimeOutError: Wenn der Arm nicht innerhalb von `timeout_duration` ankommt bzw. zur Ruhe kommt.
+        """
         global robot_position, robot_rotation
-        time.sleep(1)
+        dest = np.asarray(dest, dtype=np.float64).flatten()
+        joint_target = None if joint_target is None else np.asarray(joint_target, dtype=np.float64)
+        detector = self.settle_detector
+        if threshold != detector.position_threshold:
+            detector = SettleDetector(threshold, detector.joint_threshold, detector.velocity_threshold,
+                                      detector.settle_time, detector.hysteresis, detector.start_grace)
         start_time = time.time()
+        state = {"command_time": start_time, "settling_since": None, "in_band_at": None, "last_ratio": None}
+        sample, samples = None, 0
         while True:
-            self.my_arm.read_std()
-            joint_pos = self.my_arm.measJointPosition
-            _,_,_,_,pos, _ = self.myArmUtilities.qarm_forward_kinematics(joint_pos[:4])
-            distance = np.linalg.norm(pos - dest, ord=2)
-            if distance <= threshold:
-                start_time = time.time()
-                while True:
-                    self.my_arm.read_std()
-                    speeds = self.my_arm.measJointSpeed
-                    if(all(speed == 0 for speed in speeds)):
-                        break
-                    if time.time() - start_time > timeout_duration:
-                        raise TimeOutError(f"Timeout: Not stationary within {timeout_duration} seconds. Aborting operation.")
-                self.my_arm.read_std()
-                joint_pos = self.my_arm.measJointPosition
-                _,_,_,_,p_gripper_in_base, R_gripper_in_base = self.myArmUtilities.qarm_forward_kinematics(joint_pos[:4])
-                robot_position = p_gripper_in_base
-                robot_rotation = R_gripper_in_base
-                print(f"Arrived at {p_gripper_in_base}. Target was {dest}.")
+            remaining = start_time + timeout_duration - time.time()
+            new_sample = self.wait_for_sample(after=sample.timestamp if sample else 0.0, timeout=max(remaining, 0.0))
+            if new_sample is None:
+                position = sample.position if sample is not None else None
+                if state["in_band_at"] is not None:
+                    raise TimeOutError(f"Timeout: Not stationary within {timeout_duration} seconds. Aborting operation.")
+                raise TimeOutError(f"Timeout: Did not reach destination {dest} within {timeout_duration} seconds. Position: {position} Aborting operation.")
+            sample = new_sample
+            samples += 1
+            if detector.update(state, sample, dest, joint_target):
                 break
-            if time.time() - start_time > timeout_duration:
-                raise TimeOutError(f"Timeout: Did not reach destination {dest} within {timeout_duration} seconds. Position: {p_gripper_in_base} Aborting operation.")
-            time.sleep(0.1)
+
+        _,_,_,_,p_gripper_in_base, R_gripper_in_base = self.myArmUtilities.qarm_forward_kinematics(sample.joint_pos[:4])
+        robot_position = p_gripper_in_base
+        robot_rotation = R_gripper_in_base
+        metrics = {
+            "target": dest.tolist(),
+            "duration": round(sample.timestamp - start_time, 3),                 # Befehl bis Ankunft
+            "settle": round(sample.timestamp - state["in_band_at"], 3),          # erstes Erreichen des Ziels bis Ruhe
+            "error": round(float(np.linalg.norm(sample.position - dest, ord=2)), 4),
+            "samples": samples
+        }
+        self.move_metrics.append(metrics)
+        print(f"Arrived at {p_gripper_in_base}. Target was {dest}. ({metrics['duration']:.2f} s, davon {metrics['settle']:.2f} s Einschwingen)")
 
     def LED_Control(self, baseLED):
+        # LEDs sofort setzen (nicht hinter einem laufenden Ablauf warten); in Reihenfolge mit Bewegungen: led_async()
+        return self._led_control(baseLED)
+
+    def _led_control(self, baseLED):
         # baseLED as a 3x1 numpy array 
-        self.my_arm.write_LEDs(baseLED)
+        with self.hw_lock: # nicht gleichzeitig mit read_std des Telemetrie-Threads
+            self.my_arm.write_LEDs(baseLED)
         print(f"LED auf {baseLED} gesetzt.")
 
     def basis_drehen(self, basis_winkel):
-        scan_pos_joints = np.copy(self.my_arm.measJointPosition[:4])  # Gelenkposition speichern
+        return self._call(self._basis_drehen, basis_winkel)
+
+    def _basis_drehen(self, basis_winkel):
+        scan_pos_joints = self._read_state()[0][:4]  # Gelenkposition speichern
         scan_pos_joints[0] = np.deg2rad(basis_winkel)
         self.go_to_joint(scan_pos_joints)
         return print(f"Basis wird auf {basis_winkel} gedreht.")
 
-    def cam_to_rob(self, point_in_camera):
-        """
-        Transforms a point from the camera's coordinate system to the robot base frame using the
-        hand-eye calibration result (homogeneous transformation matrix).
-        
-        :param point_in_camera: 3D point in the camera's coordinate system [x, y, z]
-        :return: Transformed 3D point in the robot base frame [x, y, z]
+    def read_joint_positions(self):
         """
-        # Step 1: Ensure the point is in homogeneous coordinates (4x1 vector)
-        point_in_camera = np.append(point_in_camera, 1).reshape(4, 1)  # Add the homogeneous coordinate (1)
-
-        # Step 2: Construct the homogeneous transformation matrix for the camera to gripper transformation
-        H_cam2gripper = np.eye(4)  # Initialize as 4x4 identity matrix
-        H_cam2gripper[:3, :3] = self.R_cam2gripper  # Set rotation part
-        H_cam2gripper[:3, 3] = self.t_cam2gripper.flatten()  # Set translation part
+        Liest die aktuelle Gelenkstellung des Roboters einmalig aus.
+        Reiner Lesezugriff: läuft direkt (über hw_lock geschützt), ohne hinter wartenden Bewegungen anzustehen.
 
-        # Step 3: Transform the point from the camera frame to the gripper frame
-        point_in_gripper = H_cam2gripper @ point_in_camera
-
-        # Step 4: Get the current gripper pose in the base frame using forward kinematics
-        self.my_arm.read_std()  # Read the joint positions
-        joint_pos = self.my_arm.measJointPosition  # Get joint positions
-        _,_,_,_,p_gripper_in_base, R_gripper_in_base = self.myArmUtilities.qarm_forward_kinematics(joint_pos)
+        Returns:
+            np.ndarray: Kopie von measJointPosition (4 Gelenke + Greifer) in Radiant.
+        """
+        return self._read_state()[0]
 
-        # Step 5: Construct the homogeneous transformation matrix for the gripper to base transformation
-        H_gripper2base = np.eye(4)  # Initialize as 4x4 identity matrix
-        H_gripper2base[:3, :3] = R_gripper_in_base  # Set rotation part
-        H_gripper2base[:3, 3] = p_gripper_in_base.flatten()  # Set translation part
+    def capture_pose(self):
+        """
+        Liest die Gelenkstellung einmalig aus und berechnet die zugehörigen Transformationen.
+        Alle Punkte eines Kamerabildes werden anschließend mit dieser Pose umgerechnet (ohne weitere Hardware-Zugriffe).
 
-        # Step 6: Transform the point from the gripper frame to the base frame
-        point_in_base = H_gripper2base @ point_in_gripper
+        Returns:
+            ArmPose: Gelenkstellung, Greiferpose und Transformation Kamera -> Basis (jeweils 4x4) mit Zeitstempel.
+        """
+        joint_pos = self.read_joint_positions()
+        _,_,_,_,p_gripper_in_base, R_gripper_in_base = self.myArmUtilities.qarm_forward_kinematics(joint_pos[:4])
+        H_gripper2base = np.eye(4)
+        H_gripper2base[:3, :3] = R_gripper_in_base
+        H_gripper2base[:3, 3] = np.asarray(p_gripper_in_base).flatten()
+        return ArmPose(joint_pos, H_gripper2base, H_gripper2base @ self.H_cam2gripper, time.time())
 
-        # Step 7: Return the transformed point (convert homogeneous back to 3D)
-        return point_in_base[:3].flatten()
+    def cam_to_rob(self, point_in_camera, pose=None):
+        """
+        Transforms points from the camera's coordinate system to the robot base frame using the
+        hand-eye calibration result and the gripper pose (one precomputed homogeneous 4x4 matrix).
+        
+        :param point_in_camera: 3D point [x, y, z] or (N, 3) array of points in the camera's coordinate system
+        :param pose: ArmPose captured together with the image (read from the arm if omitted)
+        :return: Transformed point(s) in the robot base frame, same shape as the input
+        """
+        if pose is None:
+            pose = self.capture_pose()
+        points = np.asarray(point_in_camera, dtype=np.float64)
+        H = pose.H_cam2base
+        # p_base = R * p_cam + t für alle Punkte auf einmal
+        return points @ H[:3, :3].T + H[:3, 3]
 
     def close_connection(self):
         print("[INFO] Roboter wird heruntergefahren.")
-        self.my_arm.terminate()
+        self.cancel_pending()
+        self.telemetry_stop.set()
+        self._call(self._terminate) # erst nach der laufenden Bewegung
+
+    def _terminate(self):
+        with self.hw_lock:
+            self.my_arm.terminate()
 
 
 class JointLimitError(Exception):
@@ -0,0 +1,143 @@
+"""
+Benchmarks für Teilschritte des Scans (ohne Kamera und Roboter).
+
+Aufruf: python benchmark.py [segmentation|database]
+"""
+import os, sys, tempfile, time
+import numpy as np
+from depth_segmentation import FOREGROUND_METHODS
+
+# Intrinsics in der Größenordnung der D415 bei 1280x720
+FX, FY, CX, CY = 910.0, 910.0, 640.0, 360.0
+DEPTH_SCALE = 0.001
+
+
+def synthetic_depth_crop(rng, rows=300, cols=300, table_mm=450, object_height_mm=40, noise_mm=2.0, hole_ratio=0.02):
+    """
+    Erzeugt einen Tiefenausschnitt (uint16, mm) mit leicht geneigtem Tisch, einem Objekt in der Mitte,
+    Sensorrauschen und Pixeln ohne Tiefenwert (0).
+    """
+    r, c = np.mgrid[0:rows, 0:cols]
+    depth = table_mm + 0.05 * r + rng.normal(0, noise_mm, (rows, cols))
+    size_r, size_c = rng.integers(rows // 4, rows // 2), rng.integers(cols // 4, cols // 2)
+    r0, c0 = rng.integers(0, rows - size_r), rng.integers(0, cols - size_c)
+    depth[r0:r0 + size_r, c0:c0 + size_c] -= object_height_mm
+    depth[rng.random((rows, cols)) < hole_ratio] = 0
+    return np.clip(depth, 0, None).astype(np.uint16)
+
+
+def deproject(depth_crop, x_offset, y_offset):
+    """Deprojektion wie Camera.deproject_crop (ohne Kameraobjekt)."""
+    r, c = np.nonzero(depth_crop > 0)
+    z = depth_crop[r, c].astype(np.float32) * np.float32(DEPTH_SCALE)
+    return np.stack([(c + x_offset - CX) / FX * z, (r + y_offset - CY) / FY * z, z], axis=1).astype(np.float32)
+
+
+def benchmark_foreground_split(n_crops=20, tolerance_m=0.005, seed=0):
+    """
+    Vergleicht die Verfahren zur Vordergrundtrennung mit der KMeans-Referenz.
+    Ausgegeben werden die mittlere Laufzeit je Bounding-Box und die maximale Abweichung des Objektschwerpunkts.
+
+    :param n_crops: Anzahl synthetischer Bounding-Boxen.
+    :param tolerance_m: Zulässige Abweichung des Schwerpunkts zur Referenz in Metern.
+    :return: Dictionary {Verfahren: (mittlere Laufzeit in ms, max. Abweichung in m)}.
+    """
+    rng = np.random.default_rng(seed)
+    crops = [synthetic_depth_crop(rng) for _ in range(n_crops)]
+    cases = [(crop, deproject(crop, 400, 200), crop[crop > 0]) for crop in crops]
+
+    centroids = {}
+    results = {}
+    for name, split in FOREGROUND_METHODS.items():
+        durations = []
+        centroids[name] = []
+        for crop, points, depth_values in cases:
+            start = time.perf_counter()
+            mask = split(depth_values)
+            centroids[name].append(np.mean(points[mask], axis=0, dtype=np.float64))
+            durations.append(time.perf_counter() - start)
+        results[name] = [1000 * np.mean(durations)]
+
+    reference = np.array(centroids["kmeans"])
+    print(f"{'Verfahren':<12}{'ms/Box':>10}{'max. Abw. [mm]':>18}")
+    for name in FOREGROUND_METHODS:
+        deviation = float(np.max(np.linalg.norm(np.array(centroids[name]) - reference, axis=1)))
+        results[name].append(deviation)
+        status = "OK" if deviation <= tolerance_m else "ABWEICHUNG"
+        print(f"{name:<12}{results[name][0]:>10.2f}{1000 * deviation:>18.3f}  {status}")
+    return {name: tuple(values) for name, values in results.items()}
+
+
+def synthetic_objects(rng, n_objects):
+    """Erzeugt zufällige Objektdatensätze in der Form, die ScanManager an die Datenbank übergibt."""
+    return [{
+        "Nr": nr,
+        "Image": f"detection_{nr}.png",
+        "X": float(rng.uniform(-0.7, 0.7)), "Y": float(rng.uniform(-0.7, 0.7)), "Z": 0,
+        "Y1": float(rng.uniform(-160, 160)), "Y2": 0.0, "Y3": 0.0, "Y4": 0.0, "Y5": 0.0,
+        "Objektart": str(rng.choice(["Schraube", "Mutter", "Würfel"])),
+        "Confidence": float(rng.uniform(82.5, 99.9)),
+        "Bild_Pfad": f"Scans/makro/detection_{nr}.png",
+        "Beobachtungen": int(rng.integers(1, 4))
+    } for nr in range(1, n_objects + 1)]
+
+
+def benchmark_database(backends=("sqlite", "mysql"), n_scans=50, objects_per_scan=30, seed=0):
+    """
+    Vergleicht die Speicher-Backends von MySQLManager mit dem Schreib-/Lesemuster eines Scans:
+    Scan anlegen, alle Objekte in einer Transaktion einfügen, Scan abschließen und wieder auslesen.
+    MySQL nutzt dafür eine eigene Datenbank (objects_benchmark), SQLite eine temporäre Datei;
+    beide werden nach der Messung wieder gelöscht.
+    Nicht erreichbare Backends werden übersprungen.
+
+    :param backends: Zu vergleichende Backends ("sqlite", "mysql").
+    :param n_scans: Anzahl simulierter Scans je Backend.
+    :param objects_per_scan: Anzahl Objekte je Scan.
+    :return: Dictionary {Backend: (ms je Scan schreiben, ms je Scan lesen, Objekte/s beim Schreiben)}.
+    """
+    from sql_manager import MySQLManager
+
+    rng = np.random.default_rng(seed)
+    scans = [synthetic_objects(rng, objects_per_scan) for _ in range(n_scans)]
+
+    results = {}
+    print(f"{'Backend':<10}{'Schreiben ms/Scan':>20}{'Lesen ms/Scan':>16}{'Objekte/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for backend in backends:
+            manager = MySQLManager(backend=backend, database="objects_benchmark",
+                                   sqlite_path=os.path.join(tmp_dir, "benchmark.db"))
+            manager.connect()
+            if not manager.check_connection():
+                print(f"{backend:<10}nicht erreichbar --> übersprungen")
+                continue
+
+            write_durations, read_durations = [], []
+            try:
+                for objects in scans:
+                    start = time.perf_counter()
+                    scan_id = manager.start_scan(model="benchmark")
+                    manager.insert_many(objects, scan_id=scan_id)
+                    manager.finish_scan(scan_id, len(objects))
+                    write_durations.append(time.perf_counter() - start)
+
+                    start = time.perf_counter()
+                    df = manager.read_objects(scan_id)
+                    read_durations.append(time.perf_counter() - start)
+                    assert len(df) == len(objects)
+            finally:
+                manager.drop_database() # keine Benchmark-Datenbank auf dem Server zurücklassen
+
+            write_ms = 1000 * float(np.mean(write_durations))
+            read_ms = 1000 * float(np.mean(read_durations))
+            throughput = objects_per_scan * n_scans / float(np.sum(write_durations))
+            results[backend] = (write_ms, read_ms, throughput)
+            print(f"{backend:<10}{write_ms:>20.2f}{read_ms:>16.2f}{throughput:>12.0f}")
+    return results
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "segmentation"
+    if target == "database":
+        benchmark_database()
+    else:
+        benchmark_foreground_split()
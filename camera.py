@@ -1,8 +1,52 @@
-import cv2, os, time
+import cv2, os, time, threading
+from collections import deque, namedtuple
 import numpy as np
 import pyrealsense2 as rs
-from sklearn.cluster import KMeans
-from ultralytics import YOLO
+from yolo_model import model_registry
+from depth_segmentation import FOREGROUND_METHODS
+from image_writer import ImageWriter
+
+# Ein ausgerichtetes Bildpaar aus dem Ringpuffer der Kamera
+CameraFrame = namedtuple("CameraFrame", ["color", "depth", "timestamp", "frame_number"])
+
+# Kalibrierdaten einer Kameraverbindung (einmalig in connect() ermittelt, bei erneutem Verbinden ersetzt)
+# ray_x/ray_y: vorberechnete Strahlrichtungen (u - cx) / fx und (v - cy) / fy je Bildspalte bzw. -zeile
+CameraCalibration = namedtuple("CameraCalibration", ["intrinsics", "width", "height", "fx", "fy", "cx", "cy",
+                                                     "depth_scale", "align", "ray_x", "ray_y"])
+
+# Aufnahme an einem Scan-Halt: Bildpaar zusammen mit der Roboterpose (ArmPose) zum Aufnahmezeitpunkt,
+# damit die Auswertung auch dann korrekt ist, wenn sich der Arm bereits zum nächsten Halt bewegt
+ScanCapture = namedtuple("ScanCapture", ["color", "depth", "pose", "timestamp"])
+
+
+def create_calibration(pipeline_profile):
+    """
+    Liest Intrinsics und Tiefenskalierung aus dem aktiven Pipeline-Profil und erstellt das Alignment-Modul.
+
+    :param pipeline_profile: Aktives rs.pipeline_profile nach pipeline.start().
+    :return: CameraCalibration mit allen Werten, die im Erfassungs- und Detektionspfad benötigt werden.
+    """
+    intrinsics = pipeline_profile.get_stream(rs.stream.color).as_video_stream_profile().get_intrinsics()
+    depth_scale = pipeline_profile.get_device().first_depth_sensor().get_depth_scale()
+
+    ray_x = ((np.arange(intrinsics.width, dtype=np.float32) - intrinsics.ppx) / intrinsics.fx).astype(np.float32)
+    ray_y = ((np.arange(intrinsics.height, dtype=np.float32) - intrinsics.ppy) / intrinsics.fy).astype(np.float32)
+    ray_x.flags.writeable = False
+    ray_y.flags.writeable = False
+
+    return CameraCalibration(
+        intrinsics=intrinsics,
+        width=intrinsics.width,
+        height=intrinsics.height,
+        fx=intrinsics.fx,
+        fy=intrinsics.fy,
+        cx=intrinsics.ppx,
+        cy=intrinsics.ppy,
+        depth_scale=depth_scale,
+        align=rs.align(rs.stream.color), # Ausrichtung der Tiefen- und Farbbilder
+        ray_x=ray_x,
+        ray_y=ray_y
+    )
 
 
 class Camera:
@@ -10,19 +54,51 @@ class Camera:
     Diese Klasse stellt die Verbindung zur Intel RealSense D415 her und ermöglicht:
     - Das Starten und Stoppen des Kamerastreams (RGB- und Tiefenbilder).
     - Die Erfassung von synchronen Bildpaaren als NumPy-Arrays.
+      Ein einzelner Hintergrund-Thread liest die Pipeline aus, richtet jedes Bildpaar einmal aus und
+      legt es in einem kleinen Ringpuffer ab, aus dem alle Verbraucher (Live-Feed, Scan, Datensatz) lesen.
     - Die Anwendung eines YOLO-Modells zur Objekterkennung. [ACHTUNG: ab YOLOv8-Architektur!]
     - Die Berechnung von 3D-Koordinaten aus 2D-Pixelpositionen (unter Verwendung der Tiefeninformationen).
     - Die Transformation der ermittelten Objektpositionen in ein Roboterkoordinatensystem.
     """
-    def __init__(self, default_model_path="YOLO_Modelle/YOLOv11_default.pt"):
+    def __init__(self, default_model_path="YOLO_Modelle/YOLOv11_default.pt", buffer_size=4, max_frame_age=2.0,
+                 foreground_method="otsu", image_codec="jpg", image_quality=85, save_raw_frames=False):
         """
         Initialisiert das Kameraobjekt und lädt ein vorab trainiertes YOLO-Modell.
         
         :param default_model_path: Standardpfad zum YOLO-Modell.
+        :param buffer_size: Anzahl der zuletzt erfassten Bildpaare im Ringpuffer.
+        :param max_frame_age: Maximales Alter (s) des letzten Bildes, bis zu dem die Kamera als streamend gilt.
+        :param foreground_method: Verfahren zur Trennung von Objekt und Tisch ("otsu", "two_means", "kmeans" oder Funktion).
+        :param image_codec: Codec der Detektionsbilder ("png", "jpg" oder "webp").
+        :param image_quality: JPEG/WebP-Qualität (0-100) bzw. PNG-Kompressionsstufe (0-9) der Detektionsbilder.
+        :param save_raw_frames: Zusätzlich das unbearbeitete Farbbild jedes Scan-Halts verlustfrei (PNG) speichern.
         """
         self.pipeline = None
         self.current_model_path = default_model_path
-        self.model = YOLO(self.current_model_path)
+        self.model = model_registry.get(self.current_model_path)
+        self.model_lock = model_registry.inference_lock # Scan, Live-Detektion und Latenzmessung teilen sich die Modelle
+
+        # Ringpuffer + Hintergrund-Thread für die Bilderfassung
+        self.frame_buffer = deque(maxlen=buffer_size)
+        self.frame_condition = threading.Condition()
+        self.frame_counter = 0
+        self.grabber_thread = None
+        self.grabber_running = False
+
+        # Zustandsdaten für die Verbindungsüberwachung (ohne Bilderfassung)
+        self.max_frame_age = max_frame_age
+        self.started_at = None
+        self.grab_errors = 0
+        self.last_grab_error = None
+
+        # Intrinsics, Tiefenskalierung und Alignment der aktuellen Verbindung (siehe create_calibration)
+        self.calibration = None
+
+        self.set_foreground_method(foreground_method)
+
+        # Detektionsbilder werden im Hintergrund kodiert und gespeichert (nicht im Scan-Halt)
+        self.image_writer = ImageWriter(codec=image_codec, quality=image_quality)
+        self.save_raw_frames = save_raw_frames
     
     def connect(self):
         """
@@ -46,79 +122,226 @@ class Camera:
             self.config.enable_stream(rs.stream.color, 1280, 720, rs.format.bgr8, 30)
             self.pipeline_profile = self.pipeline.start(self.config)
             
-            # Ausrichtung der Tiefen- und Farbbilder
-            self.align = rs.align(rs.stream.color)
-            
-            # Ermittlung des Tiefenskalierungsfaktors
-            profile = self.pipeline.get_active_profile()
-            depth_sensor = profile.get_device().first_depth_sensor()
-            self.depth_scale = depth_sensor.get_depth_scale()
+            # Intrinsics, Tiefenskalierung und Alignment einmalig je Verbindung ermitteln
+            self.calibration = create_calibration(self.pipeline_profile)
 
-            print(f"[INFO] RealSense-Kamera erfolgreich gestartet (1280x720, 30 FPS). Tiefenskalierung: {self.depth_scale:.6f}")
+            print(f"[INFO] RealSense-Kamera erfolgreich gestartet (1280x720, 30 FPS). Tiefenskalierung: {self.calibration.depth_scale:.6f}")
+            self.start_grabber()
             return True
         except Exception as e:
             print(f"[FEHLER] Kamera konnte nicht gestartet werden: {e}")
             return False
     
-    def get_stream(self):
+    def start_grabber(self):
         """
-        Erfasst ein synchronisiertes Bildpaar (Farbbild und Tiefenbild) von der Kamera.
-        
-        :return: Tuple (color_image, depth_image) als NumPy-Arrays oder (None, None) bei Fehlern.
+        Startet den Hintergrund-Thread, der fortlaufend Bildpaare erfasst, ausrichtet und im Ringpuffer ablegt.
         """
-        try:
-            ctx = rs.context()
-            devices = ctx.devices
-            if len(devices) == 0:
-                return None, None
-            
-            frames = self.pipeline.wait_for_frames(1000) # max 1s warten
-            aligned_frames = self.align.process(frames)
+        if self.grabber_thread is not None and self.grabber_thread.is_alive():
+            return
+        with self.frame_condition:
+            self.frame_buffer.clear()
+        self.grab_errors = 0
+        self.last_grab_error = None
+        self.started_at = time.time()
+        self.grabber_running = True
+        self.grabber_thread = threading.Thread(target=self._grab_frames, name="realsense-grabber", daemon=True)
+        self.grabber_thread.start()
+
+    def stop_grabber(self):
+        """Beendet den Erfassungs-Thread und leert den Ringpuffer."""
+        self.grabber_running = False
+        self.started_at = None
+        if self.grabber_thread is not None:
+            self.grabber_thread.join(timeout=2)
+            self.grabber_thread = None
+        with self.frame_condition:
+            self.frame_buffer.clear()
+            self.frame_condition.notify_all()
+
+    def _grab_frames(self):
+        """
+        Schleife des Erfassungs-Threads: Einziger Aufrufer von wait_for_frames() und align.process().
+        Jedes Bildpaar wird genau einmal ausgerichtet und anschließend allen Lesern bereitgestellt.
+        """
+        while self.grabber_running:
+            try:
+                frames = self.pipeline.wait_for_frames(1000) # max 1s warten
+                aligned_frames = self.calibration.align.process(frames)
+
+                color_frame = aligned_frames.get_color_frame()
+                depth_frame = aligned_frames.get_depth_frame()
+                if not color_frame or not depth_frame:
+                    continue
+
+                # Frames aus dem SDK-Pool lösen, damit sie im Ringpuffer gehalten werden dürfen
+                aligned_frames.keep()
+                color_image = np.asanyarray(color_frame.get_data())
+                depth_image = np.asanyarray(depth_frame.get_data())
+                color_image.flags.writeable = False # geteilter Puffer --> nur lesen
+                depth_image.flags.writeable = False
+
+                with self.frame_condition:
+                    self.frame_counter += 1
+                    self.frame_buffer.append(CameraFrame(
+                        color=color_image,
+                        depth=depth_image,
+                        timestamp=time.time(),
+                        frame_number=self.frame_counter
+                    ))
+                    self.frame_condition.notify_all()
+            except Exception as e:
+                if self.grabber_running:
+                    self.grab_errors += 1
+                    self.last_grab_error = str(e)
+                    print(f"[WARNUNG] Kein Bildpaar von der Kamera erhalten: {e}")
+                    time.sleep(0.1)
+
+    def get_latest_frame(self):
+        """
+        Liefert das zuletzt erfasste Bildpaar aus dem Ringpuffer, ohne zu blockieren.
 
-            color_frame = aligned_frames.get_color_frame()
-            depth_frame = aligned_frames.get_depth_frame()
+        :return: CameraFrame oder None, falls (noch) kein Bild vorliegt.
+        """
+        with self.frame_condition:
+            return self.frame_buffer[-1] if self.frame_buffer else None
 
-            if not color_frame or not depth_frame:
-                raise ValueError("Keine gültigen Frames von der Kamera erhalten.")
+    def wait_for_frame(self, after_frame_number=0, timeout=1.0):
+        """
+        Wartet, bis ein Bildpaar mit einer größeren Bildnummer als `after_frame_number` vorliegt.
 
-            # Konvertiere Frames in NumPy-Arrays
-            color_image = np.asanyarray(color_frame.get_data())
-            depth_image = np.asanyarray(depth_frame.get_data())
+        :param after_frame_number: Bildnummer des zuletzt verarbeiteten Bildes (0 = beliebiges Bild).
+        :param timeout: Maximale Wartezeit in Sekunden.
+        :return: CameraFrame oder None bei Zeitüberschreitung.
+        """
+        with self.frame_condition:
+            self.frame_condition.wait_for(
+                lambda: (self.frame_buffer and self.frame_buffer[-1].frame_number > after_frame_number)
+                        or not self.grabber_running,
+                timeout=timeout
+            )
+            if self.frame_buffer and self.frame_buffer[-1].frame_number > after_frame_number:
+                return self.frame_buffer[-1]
+            return None
 
-            return color_image, depth_image
-        except Exception as e:
+    def get_stream(self, fresh=False):
+        """
+        Liefert ein synchronisiertes Bildpaar (Farbbild und Tiefenbild) aus dem Ringpuffer.
+        
+        :param fresh: True, um auf ein Bild zu warten, das erst nach dem Aufruf erfasst wurde (z.B. nach einer Roboterbewegung).
+        :return: Tuple (color_image, depth_image) als NumPy-Arrays oder (None, None) bei Fehlern.
+        """
+        latest = self.get_latest_frame()
+        if fresh or latest is None:
+            latest = self.wait_for_frame(latest.frame_number if latest else 0, timeout=1.0) # max 1s warten
+        if latest is None:
             return None, None
+        # Farbbild kopieren, da Aufrufer darin zeichnen (z.B. Bounding-Boxen)
+        return latest.color.copy(), latest.depth
+
+    def get_calibration(self):
+        """
+        Liefert die Kalibrierdaten der aktuellen Verbindung (Intrinsics, Tiefenskalierung, Alignment).
+
+        :return: CameraCalibration oder None, falls keine Kamera verbunden ist.
+        """
+        return self.calibration
 
     def close_connection(self):
         """Beendet die Verbindung zur Kamera"""
+        self.stop_grabber()
         self.pipeline.stop()
+        self.calibration = None
         print("[INFO] Verbindung zur RealSense-Kamera wurde geschlossen.")
 
+    def get_health(self):
+        """
+        Liefert den Zustand der Kamera ausschließlich aus Pipeline-Status und Bildzählern.
+        Es wird kein Bild erfasst und nicht blockiert, daher für häufiges Polling (Status-Icons, Routen) geeignet.
+
+        :return: Dictionary mit
+            - connected (bool): Pipeline gestartet und Erfassungs-Thread aktiv.
+            - streaming (bool): Letztes Bild ist jünger als `max_frame_age`.
+            - last_frame_age (float | None): Alter des letzten Bildes in Sekunden.
+            - frame_number (int): Fortlaufende Nummer des letzten Bildes.
+            - fps (float | None): Aus den Zeitstempeln des Ringpuffers geschätzte Bildrate.
+            - grab_errors (int): Anzahl fehlgeschlagener Erfassungen seit dem Start.
+            - last_error (str | None): Letzte Fehlermeldung des Erfassungs-Threads.
+        """
+        now = time.time()
+        with self.frame_condition:
+            latest = self.frame_buffer[-1] if self.frame_buffer else None
+            oldest = self.frame_buffer[0] if self.frame_buffer else None
+
+        connected = (self.started_at is not None and self.grabber_thread is not None
+                     and self.grabber_thread.is_alive())
+        last_frame_age = now - latest.timestamp if latest else None
+        fps = None
+        if latest and oldest and latest.timestamp > oldest.timestamp:
+            fps = (latest.frame_number - oldest.frame_number) / (latest.timestamp - oldest.timestamp)
+
+        return {
+            "connected": connected,
+            "streaming": connected and last_frame_age is not None and last_frame_age <= self.max_frame_age,
+            "last_frame_age": last_frame_age,
+            "frame_number": latest.frame_number if latest else 0,
+            "fps": fps,
+            "grab_errors": self.grab_errors,
+            "last_error": self.last_grab_error
+        }
+
     def check_connection(self):
         """
         Hintergrundprozess, der die Kamera-Verbindung alle {Intervall} Sekunden überprüft.
+        Nutzt nur get_health() und erfasst selbst keine Bilder.
 
         :return: True, wenn eine aktive Verbindung besteht, andernfalls False.
         """
         try:
-            color_image, depth_image = self.get_stream()
-            if color_image is None or depth_image is None:
-                return False
-            else:
+            health = self.get_health()
+            if health["streaming"]:
                 return True
+            # Direkt nach dem Start liegt evtl. noch kein Bild vor --> Anlaufzeit tolerieren
+            starting = health["connected"] and health["last_frame_age"] is None
+            return starting and time.time() - self.started_at <= self.max_frame_age
         except:
             return False
 
-    def load_new_model(self, new_model_path):
+    def load_new_model(self, new_model_path, backend="pytorch"):
         """
-        Lädt ein neues YOLO-Modell.
+        Wechselt auf ein YOLO-Modell aus der gemeinsamen Modell-Registry und wärmt es vor dem Wechsel auf (blockierend),
+        damit bereits die erste Detektion (z.B. am ersten Scan-Halt) ohne Initialisierungskosten läuft.
+        Ist das Modell bereits aktiv, aufgewärmt und die Datei unverändert, entstehen keine Kosten.
         
         :param new_model_path: Relativer Pfad zum neuen YOLO-Modell.
+        :param backend: Inferenz-Backend ("pytorch", "onnx", "openvino", "openvino_int8").
         """
         full_model_path = os.path.join("YOLO_Modelle", new_model_path)
-        self.model = YOLO(full_model_path)
-        self.current_model_path = full_model_path
-        print(f"[INFO] YOLO-Modell erfolgreich gewechselt: {new_model_path}")
+        resolved_path = model_registry.resolve(full_model_path, backend)
+        if resolved_path == self.current_model_path and model_registry.is_current(resolved_path, self.model):
+            model_registry.warm_up(full_model_path, backend) # übersprungen, falls bereits aufgewärmt
+            return
+        model = model_registry.get(full_model_path, backend)
+        model_registry.warm_up(full_model_path, backend)
+        with self.model_lock:
+            self.model = model
+            self.current_model_path = resolved_path
+        model_registry.measure_latency_async(full_model_path, backend) # startet erst nach einem laufenden Scan
+        print(f"[INFO] YOLO-Modell erfolgreich gewechselt: {new_model_path} ({backend})")
+
+    def set_foreground_method(self, method):
+        """
+        Legt das Verfahren zur Trennung von Objekt und Hintergrund innerhalb einer Bounding-Box fest.
+
+        :param method: Name aus depth_segmentation.FOREGROUND_METHODS oder eine Funktion,
+                       die zu den gültigen Tiefenwerten (uint16) eine boolesche Maske des Objekts liefert.
+        """
+        if callable(method):
+            self.foreground_split = method
+        elif method in FOREGROUND_METHODS:
+            self.foreground_split = FOREGROUND_METHODS[method]
+        else:
+            raise ValueError(f"Unbekanntes Verfahren zur Vordergrundtrennung: {method}")
+        self.foreground_method = method
 
 # ----------------------------------------------------------
 # ----------------------------------------------------------
@@ -129,33 +352,64 @@ class Camera:
         
         :return: NumPy-Array mit den kartesischen Koordinaten [X, Y, Z] in Metern.
         """
-        z = depth_value * self.depth_scale  # Umwandlung in Meter
-        x = (x - self.cx) * z / self.fx
-        y = (y - self.cy) * z / self.fy
+        calib = self.calibration
+        z = depth_value * calib.depth_scale  # Umwandlung in Meter
+        x = (x - calib.cx) * z / calib.fx
+        y = (y - calib.cy) * z / calib.fy
         return np.array([x, y, z])
+
+    def deproject_crop(self, depth_crop, x_offset=0, y_offset=0):
+        """
+        Vektorisierte Variante von pixel_to_pointcloud() für einen ganzen Bildausschnitt.
+        Nutzt die vorberechneten Strahltabellen aus den Kalibrierdaten.
+
+        :param depth_crop: uint16-Tiefenwerte des Ausschnitts (rows x cols).
+        :param x_offset: Spalte der linken oberen Ecke des Ausschnitts im Gesamtbild.
+        :param y_offset: Zeile der linken oberen Ecke des Ausschnitts im Gesamtbild.
+        :return: (N, 3) float32-Array mit [X, Y, Z] in Metern für alle Pixel mit Tiefenwert > 0.
+        """
+        calib = self.calibration
+        rows, cols = depth_crop.shape
+        ray_x = calib.ray_x[x_offset:x_offset + cols]
+        ray_y = calib.ray_y[y_offset:y_offset + rows]
+
+        valid = depth_crop > 0
+        r, c = np.nonzero(valid)
+        z = depth_crop[valid].astype(np.float32) * np.float32(calib.depth_scale) # Umwandlung in Meter
+
+        points = np.empty((z.size, 3), dtype=np.float32)
+        points[:, 0] = ray_x[c] * z
+        points[:, 1] = ray_y[r] * z
+        points[:, 2] = z
+        return points
     
-    def detect_objects(self, qarm, confidence_threshold = 0.825):
+    def capture(self, qarm):
+        """
+        Nimmt ein frisches Bildpaar auf und hält die aktuelle Pose des Roboters fest (ein Hardware-Zugriff).
+        Danach darf sich der Roboter bereits weiterbewegen.
+
+        :param qarm: Roboterarm, dessen Pose gespeichert wird.
+        :return: ScanCapture mit Farbbild, Tiefenbild, ArmPose und Zeitstempel.
+        """
+        color_image, depth_image = self.get_stream(fresh=True) # Bild nach Ankunft des Roboters erhalten
+        return ScanCapture(color_image, depth_image, qarm.capture_pose(), time.time())
+
+    def detect_objects(self, qarm, confidence_threshold = 0.825, capture=None):
         """
         Erkennt Objekte im Farbbild mithilfe eines YOLO-Modells und berechnet deren 3D-Koordinaten.
         
         :param qarm: Roboterarm für die Berechnung der Koordinaten
         :param confidence_threshold: Mindestkonfidenz, ab der eine Erkennung akzeptiert wird.
+        :param capture: Bereits aufgenommene ScanCapture (z.B. im Pipeline-Scan); ohne Angabe wird neu aufgenommen.
         :return: Liste mit Detektionsdaten + Name des Detektionsbildes + Pfad
         """
-        # Alignment initialisieren
-        self.align_to = rs.stream.color
-        self.align = rs.align(self.align_to)
-
-        # Intrinsische Parameter
-        self.intrinsics = self.pipeline_profile.get_stream(rs.stream.color).as_video_stream_profile().get_intrinsics()
-        self.fx = self.intrinsics.fx
-        self.fy = self.intrinsics.fy
-        self.cx = self.intrinsics.ppx
-        self.cy = self.intrinsics.ppy
-
-        
-        color_image, depth_image = self.get_stream() # Bild erhalten
-        results = self.model(color_image) # YOLO-Modell anwenden
+        if capture is None:
+            capture = self.capture(qarm)
+        color_image, depth_image = capture.color, capture.depth
+        # Rohbild vor dem Einzeichnen der Boxen sichern (z.B. für neue Trainingsdaten)
+        raw_image = color_image.copy() if self.save_raw_frames else None
+        with self.model_lock:
+            results = self.model(color_image) # YOLO-Modell anwenden
         detections = []  # Liste für die Detektionen
 
         for box in results[0].boxes:
@@ -180,90 +434,56 @@ class Camera:
             if rows == 0 or cols == 0:
                 continue
 
-            # Meshgrid für Pixel-Koord
-            c, r = np.meshgrid(np.arange(cols), np.arange(rows))
-            depth_values = depth_crop.flatten()
-            x_flat = c.flatten() + x1
-            y_flat = r.flatten() + y1
-
-            # Tiefenwert sollte > 0 sein
-            valid = depth_values > 0
-            if np.count_nonzero(valid) == 0:
+            # 3D-Koordinaten aller gültigen Pixel (Tiefenwert > 0) auf einmal berechnen
+            points = self.deproject_crop(depth_crop, x1, y1)
+            if len(points) == 0:
                 print(f"[WARNUNG] Keine gültigen Tiefenwerte für '{class_name}' erkannt.")
                 continue
 
-            x_valid = x_flat[valid]
-            y_valid = y_flat[valid]
-            depth_valid = depth_values[valid]
-
-            # 3D-Koordinaten berechnen
-            points = []
-            for xi, yi, di in zip(x_valid, y_valid, depth_valid):
-                point = self.pixel_to_pointcloud(xi, yi, di)
-                points.append(point)
-            points = np.array(points)
+            # Trennung von Objekt und Hintergrund anhand der Tiefenwerte --> näheres Cluster betrachten
+            # (gleiche Reihenfolge wie in deproject_crop, daher direkt als Maske auf points nutzbar)
+            object_mask = self.foreground_split(depth_crop[depth_crop > 0])
+            object_cluster = points[object_mask]
 
-            # KMeans-Clustering zur Trennung von Objekt und Hintergrund (mit k=2)
-            kmeans = KMeans(n_clusters=2, random_state=0).fit(points[:, 2].reshape(-1, 1))
-            labels = kmeans.labels_
+            # Berechnung des Objektschwerpunkts
+            centroid = np.mean(object_cluster, axis=0, dtype=np.float64)
+            centroid[2] += 0.03
 
-            # Näheres Cluster betrachten
-            object_cluster = points[labels == (kmeans.cluster_centers_.argmin())]
+            # Speicherung der Detektionsdaten (Greifpunkt folgt gesammelt für alle Objekte)
+            detections.append({
+                'class_name': class_name,
+                'bbox': [x1, y1, x2, y2],
+                'confidence': conf,
+                'grasp_point': centroid
+            })
 
-            # Berechnung des Objektschwerpunkts
-            centroid = np.mean(object_cluster, axis=0)
+        if detections:
+            # Alle Schwerpunkte mit einer Transformation in Roboterkoordinaten umrechnen (Pose der Aufnahme)
+            grasp_points = qarm.cam_to_rob(np.array([d['grasp_point'] for d in detections]), capture.pose)
 
-            # Berechnung des Objektschwerpunkts
-            centroid[2] += 0.03
-            grasp_point_in_base = qarm.cam_to_rob(centroid)
-            
             # ------------------------
             # z-Koord fehlerhaft? --> HIER: z manuell erhöhen (Makro-Scan-Position)
             # Anpassung der Z-Koordinate basierend auf der Entfernung zur Basis --> vorne tiefer, hinten höher
-            sum_xy = abs(grasp_point_in_base[0]) + abs(grasp_point_in_base[1])
-            z_offset = 0.03 + (sum_xy - 0.15) / (1.6 - 0.15) * (0.13 - 0.03)
-            grasp_point_in_base[2] = z_offset
+            sum_xy = np.abs(grasp_points[:, 0]) + np.abs(grasp_points[:, 1])
+            grasp_points[:, 2] = 0.03 + (sum_xy - 0.15) / (1.6 - 0.15) * (0.13 - 0.03)
 
-            # Speicherung der Detektionsdaten
-            detection = {
-                'class_name': class_name,
-                'bbox': [x1, y1, x2, y2],
-                'confidence': conf,
-                'grasp_point': grasp_point_in_base
-            }
-            detections.append(detection)
-            print(f"[INFO] Detektion: {detection}")
+            for detection, grasp_point_in_base in zip(detections, grasp_points):
+                detection['grasp_point'] = grasp_point_in_base
+                print(f"[INFO] Detektion: {detection}")
 
-        # Speicherung des annotierten Bildes mit Bounding Boxes
+        # Speicherung des annotierten Bildes mit Bounding Boxes (asynchron über den ImageWriter)
         output_dir = "Scans/makro"
-        timestamp = time.time()
-        img_filename = f"detection_{timestamp:.0f}.png"
+        # Millisekunden: im Pipeline-Scan können mehrere Halte innerhalb einer Sekunde ausgewertet werden
+        stem = f"{1000 * capture.timestamp:.0f}"
+        img_filename = f"detection_{stem}{self.image_writer.extension}"
         output_path = os.path.join(output_dir, img_filename)
-        cv2.imwrite(output_path, color_image)
-        print(f"[INFO] Detektionsergebniss gespeichert in: {output_path}")
+        self.image_writer.submit(output_path, color_image)
+        if raw_image is not None:
+            self.image_writer.submit(os.path.join("Scans/raw", f"raw_{stem}.png"), raw_image, codec="png")
+        print(f"[INFO] Detektionsergebniss wird gespeichert in: {output_path}")
 
         if not detections:
             print("[INFO] Keine Objekte erkannt.")
             return None
 
         return detections, img_filename, output_path
-
-
-
-    def get_depth_frame_raw(self):
-        """
-        Liefert den originalen Tiefenframe (rs.frame), ohne ihn in ein NumPy-Array umzuwandeln.
-        Wird für den MJPEG-Stream verwendet, damit der Colorizer damit arbeiten kann.
-        
-        :return: Tiefenframe-Objekt (rs.frame) oder None bei Fehlern.
-        """
-        try:
-            frames = self.pipeline.wait_for_frames(1000)
-            aligned_frames = self.align.process(frames)
-            depth_frame = aligned_frames.get_depth_frame()
-            if not depth_frame:
-                raise ValueError("[WARNUNG] Kein gültiger Tiefenframe empfangen.")
-            return depth_frame
-        except Exception as e:
-            print(f"[FEHLER] Fehler beim Abrufen des rohen Tiefenframes: {e}")
-            return None
\ No newline at end of file
@@ -1,9 +1,7 @@
-import cv2, dash, os
+import dash, os
 from dash import dcc, html, Input, Output, State, no_update
 import dash_bootstrap_components as dbc
-from flask import Response
-import numpy as np
-import pyrealsense2 as rs
+from flask import Response, jsonify, request, send_file
 
 
 # NavigationBar und Tabs
@@ -18,6 +16,9 @@ from tab_yolo import YoloModel
 from sql_manager import MySQLManager
 from yolo_model import YOLOModelController
 from camera import Camera
+from depth_colorizer import DepthColorizer
+from detection_stream import DetectionWorker
+from mjpeg_stream import MJPEGStreamHub
 from QArmControl import QArmControl
 import stt_callbacks
 
@@ -65,7 +66,8 @@ app.layout = html.Div([
 
 
     # Speichern von Variablen für die gesamte Session
-    dcc.Store(id="scan-df-store", storage_type="session", data=[]), # --> Scan-DataFrame mit allen erkannten Objekten
+    dcc.Store(id="scan-df-store", storage_type="session", data=None), # --> Referenz {scan_id, version} auf das Scan-Ergebnis im Server-Cache
+    dcc.Store(id="scan-job-store", storage_type="session", data=None), # --> laufende Hintergrundaufgabe {job_id, kind, message} (Scan, Pick & Place)
     dcc.Store(id="stt-command-store", storage_type="session", data=""), # --> STT Befehl
     dcc.Store(id="stt-feedback-store", storage_type="session", data=""), # --> TTS Antwort
     dcc.Store(id="pseudo-click-store", storage_type="session", data=""), # --> Pseudo Klick durch Sprachbefehl
@@ -138,54 +140,76 @@ app.layout = html.Div([
 #---------------------------------------------------------------------------------------------------
 #-------------------------- LIVE FEED - VIDEO STREAM -----------------------------------------------
 #---------------------------------------------------------------------------------------------------
-def gen_frames_rgb():
-    """Generator, der kontinuierlich den aktuellen RGB-Frame abruft und als MJPEG-Stream liefert."""
-    while True:
-        # Hole den aktuellen Frame aus dem gemeinsamen Kamera-Puffer
-        color_frame, _ = camera.get_stream()
-        if color_frame is None:
-            continue
-        ret, buffer = cv2.imencode('.jpg', color_frame)
-        if not ret:
-            continue
-        frame_bytes = buffer.tobytes()
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-
-def gen_frames_depth():
-    """Generator, der den Tiefenframe (mit Colorizer) abruft und als MJPEG-Stream liefert."""
-    colorizer = rs.colorizer()
-    while True:
-        raw_depth = camera.get_depth_frame_raw()
-        if raw_depth is None:
-            continue
-        try:
-            # Wende den Colorizer auf den rohen depth_frame an
-            colorized_depth = colorizer.colorize(raw_depth)
-        except Exception as e:
-            print(f"[FEHLER] Fehler beim Colorisieren des Tiefenframes: {e}")
-            continue
-        depth_image = np.asanyarray(colorized_depth.get_data())
-        ret, buffer = cv2.imencode('.jpg', depth_image)
-        if not ret:
-            continue
-        frame_bytes = buffer.tobytes()
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-
+depth_colorizer = DepthColorizer(min_depth=0.2, max_depth=1.5)
+# Live-Overlay nutzt das in Navbar/YOLO-Tab gewählte Modell (inkl. Backend) des YOLOModelControllers
+detection_worker = DetectionWorker(camera, get_model=yolo_controller.get_model,
+                                   get_model_name=yolo_controller.get_current_model_name, confidence_threshold=0.5)
+
+def render_depth(frame):
+    """Färbt das Tiefenbild desselben Bildpaars wie im RGB-Stream per Lookup-Tabelle ein."""
+    calibration = camera.get_calibration()
+    if calibration is not None:
+        depth_colorizer.configure(depth_scale=calibration.depth_scale)
+    return depth_colorizer.colorize(frame.depth)
+
+# Ein Broadcaster je Stream und Profil: jedes Bild wird je Profil einmal skaliert, kodiert und an alle Clients verteilt
+stream_hub = MJPEGStreamHub(
+    camera,
+    renderers={"rgb": lambda frame: frame.color, "depth": render_depth, "detections": detection_worker.draw},
+    default_profiles={"rgb": {"fps": 30}, "depth": {"fps": 15}, "detections": {"fps": 30}}
+)
 
 # Flask-Routen für die Video-Feeds
+# Optionale Query-Parameter: width (Pixel), quality (JPEG 0-100), fps --> z.B. /video_feed_rgb?width=640&quality=50&fps=10
 @server.route('/video_feed_rgb')
 def video_feed_rgb():
     if not camera.check_connection():
         return Response("Keine Kamera verbunden.", mimetype="text/plain")
-    return Response(gen_frames_rgb(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    return Response(stream_hub.get("rgb", request.args).stream(), mimetype='multipart/x-mixed-replace; boundary=frame')
 
 @server.route('/video_feed_depth')
 def video_feed_depth():
     if not camera.check_connection():
         return Response("Keine Kamera verbunden.", mimetype="text/plain")
-    return Response(gen_frames_depth(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    return Response(stream_hub.get("depth", request.args).stream(), mimetype='multipart/x-mixed-replace; boundary=frame')
+
+@server.route('/video_feed_detections')
+def video_feed_detections():
+    if not camera.check_connection():
+        return Response("Keine Kamera verbunden.", mimetype="text/plain")
+    return Response(stream_hub.get("detections", request.args).stream(), mimetype='multipart/x-mixed-replace; boundary=frame')
+
+@server.route('/detections')
+def detections():
+    """Ergebnis der letzten Live-Detektion als JSON."""
+    return jsonify(detection_worker.get_result())
+
+@server.route('/camera_health')
+def camera_health():
+    """Zustand der Kamera als JSON (ohne Bilderfassung)."""
+    return jsonify(camera.get_health())
+
+# Flask-Routen für die Scanbilder (URLs enthalten ?v=<Änderungszeit> --> dürfen dauerhaft gecacht werden)
+@server.route('/scan_images/thumb/<filename>')
+def scan_image_thumbnail(filename):
+    """Verkleinertes JPEG eines Scanbildes."""
+    jpeg = scan.image_store.thumbnail(filename)
+    if jpeg is None:
+        return Response("Bild nicht gefunden.", status=404, mimetype="text/plain")
+    response = Response(jpeg, mimetype="image/jpeg")
+    response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
+
+@server.route('/scan_images/full/<filename>')
+def scan_image_full(filename):
+    """Scanbild in voller Auflösung."""
+    path = scan.image_store.resolve(filename)
+    if path is None:
+        return Response("Bild nicht gefunden.", status=404, mimetype="text/plain")
+    try:
+        return send_file(os.path.abspath(path), mimetype=scan.image_store.mimetype(filename), max_age=31536000)
+    except OSError: # zwischen resolve() und dem Öffnen gelöscht (z.B. durch einen neuen Scan)
+        return Response("Bild nicht gefunden.", status=404, mimetype="text/plain")
 
 #---------------------------------------------------------------------------------------------------
 #------------- TAB-INHALT basierend auf aktivem Tab anzeigen ---------------------------------------
@@ -254,7 +278,7 @@ def update_cam_icon(n_intervals, n_clicks):
             else:
                 print("[INFO] Kamera-Verbindung wird per Klick hergestellt...")
                 success = camera.connect()
-    # Icon-Status je Zustand
+    # Icon-Status je Zustand (nur Pipeline-Status und Bildzähler, keine Bilderfassung)
     if camera.check_connection():
         icon_farbe = "connected"
     else:
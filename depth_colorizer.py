@@ -0,0 +1,75 @@
+import cv2
+import numpy as np
+
+class DepthColorizer:
+    """
+    Diese Klasse färbt Tiefenbilder (uint16) über eine vorberechnete Lookup-Tabelle ein.
+
+    Funktionen:
+    - Bildet jeden möglichen Rohwert (0-65535) einmalig auf eine BGR-Farbe ab.
+    - Das Einfärben eines Bildes ist danach eine einzige Tabellenabfrage (kein SDK-Colorizer nötig).
+    - Konfigurierbarer Tiefenbereich und OpenCV-Colormap; Pixel ohne Tiefenwert bleiben schwarz.
+    """
+    def __init__(self, min_depth=0.2, max_depth=1.5, colormap=cv2.COLORMAP_JET, depth_scale=0.001):
+        """
+        Initialisiert den Colorizer und berechnet die Lookup-Tabelle.
+
+        Args:
+            min_depth (float): Untere Grenze des Farbbereichs in Metern (nah = rot).
+            max_depth (float): Obere Grenze des Farbbereichs in Metern (fern = blau).
+            colormap (int): OpenCV-Colormap (z.B. cv2.COLORMAP_JET, cv2.COLORMAP_TURBO).
+            depth_scale (float): Meter je Rohwert (aus den Kalibrierdaten der Kamera).
+        """
+        self.min_depth = min_depth
+        self.max_depth = max_depth
+        self.colormap = colormap
+        self.depth_scale = depth_scale
+        self.lut = self.build_lut()
+
+    def build_lut(self):
+        """
+        Berechnet die Lookup-Tabelle für alle 65536 Rohwerte.
+
+        Returns:
+            np.ndarray: (65536, 3) uint8-Array mit BGR-Farben.
+        """
+        raw = np.arange(65536, dtype=np.float32) * self.depth_scale
+        normalized = (raw - self.min_depth) / (self.max_depth - self.min_depth)
+        # nah = rot, fern = blau (wie beim RealSense-Colorizer)
+        levels = (255 * (1 - np.clip(normalized, 0, 1))).astype(np.uint8)
+        palette = cv2.applyColorMap(np.arange(256, dtype=np.uint8).reshape(-1, 1), self.colormap).reshape(256, 3)
+        lut = palette[levels]
+        lut[0] = 0 # kein Tiefenwert --> schwarz
+        return lut
+
+    def configure(self, min_depth=None, max_depth=None, colormap=None, depth_scale=None):
+        """
+        Ändert Bereich, Colormap oder Tiefenskalierung und berechnet die Tabelle nur bei Änderungen neu.
+
+        Args:
+            min_depth (float, optional): Neue untere Grenze in Metern.
+            max_depth (float, optional): Neue obere Grenze in Metern.
+            colormap (int, optional): Neue OpenCV-Colormap.
+            depth_scale (float, optional): Neue Tiefenskalierung (Meter je Rohwert).
+        """
+        new_settings = (
+            self.min_depth if min_depth is None else min_depth,
+            self.max_depth if max_depth is None else max_depth,
+            self.colormap if colormap is None else colormap,
+            self.depth_scale if depth_scale is None else depth_scale,
+        )
+        if new_settings != (self.min_depth, self.max_depth, self.colormap, self.depth_scale):
+            self.min_depth, self.max_depth, self.colormap, self.depth_scale = new_settings
+            self.lut = self.build_lut()
+
+    def colorize(self, depth_image):
+        """
+        Färbt ein Tiefenbild ein.
+
+        Args:
+            depth_image (np.ndarray): uint16-Tiefenbild (H x W).
+
+        Returns:
+            np.ndarray: BGR-Bild (H x W x 3, uint8).
+        """
+        return np.take(self.lut, depth_image, axis=0)
@@ -0,0 +1,99 @@
+"""
+Verfahren zur Trennung von Objekt (Vordergrund) und Tisch (Hintergrund) innerhalb einer Bounding-Box.
+
+Alle Verfahren erhalten die gültigen Tiefenwerte (uint16, > 0) einer Bounding-Box als 1D-Array und liefern
+eine boolesche Maske gleicher Länge zurück (True = näheres Cluster bzw. Objekt).
+- "otsu":      Otsu-Schwellwert auf dem Histogramm der Tiefenwerte (Standard).
+- "two_means": 1D-Zwei-Mittelwerte-Verfahren (entspricht KMeans mit k=2) auf dem Histogramm.
+- "kmeans":    sklearn KMeans(n_clusters=2) als Referenz (deutlich langsamer).
+"""
+import numpy as np
+
+
+def _histogram(depth_values):
+    """
+    Erstellt ein Histogramm mit einem Bin pro Tiefenstufe (uint16) zwischen Minimum und Maximum.
+
+    :param depth_values: 1D-Array der gültigen Tiefenwerte.
+    :return: Tuple (counts, bin_values) als NumPy-Arrays.
+    """
+    depth_values = np.asarray(depth_values).astype(np.int64, copy=False)
+    d_min = int(depth_values.min())
+    counts = np.bincount(depth_values - d_min).astype(np.float64)
+    bin_values = np.arange(d_min, d_min + counts.size, dtype=np.float64)
+    return counts, bin_values
+
+
+def split_otsu(depth_values):
+    """
+    Trennt Objekt und Hintergrund mit dem Otsu-Schwellwert (maximale Varianz zwischen den Klassen).
+
+    :param depth_values: 1D-Array der gültigen Tiefenwerte.
+    :return: Boolesche Maske des näheren Clusters.
+    """
+    counts, bin_values = _histogram(depth_values)
+    if counts.size == 1:
+        return np.ones(len(depth_values), dtype=bool)
+
+    weight_near = np.cumsum(counts)
+    sum_near = np.cumsum(counts * bin_values)
+    weight_far = weight_near[-1] - weight_near
+    sum_far = sum_near[-1] - sum_near
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_near = sum_near / weight_near
+        mean_far = sum_far / weight_far
+        between_var = weight_near * weight_far * (mean_near - mean_far) ** 2
+    between_var[~np.isfinite(between_var)] = -1
+
+    threshold = bin_values[int(np.argmax(between_var))]
+    return np.asarray(depth_values) <= threshold
+
+
+def split_two_means(depth_values, max_iter=50):
+    """
+    Trennt Objekt und Hintergrund mit einem 1D-Zwei-Mittelwerte-Verfahren (Lloyd-Iteration).
+    Startwerte sind Minimum und Maximum, gerechnet wird auf dem Histogramm statt auf den Einzelwerten.
+
+    :param depth_values: 1D-Array der gültigen Tiefenwerte.
+    :param max_iter: Maximale Anzahl an Iterationen.
+    :return: Boolesche Maske des näheren Clusters.
+    """
+    counts, bin_values = _histogram(depth_values)
+    if counts.size == 1:
+        return np.ones(len(depth_values), dtype=bool)
+
+    cum_counts = np.cumsum(counts)
+    cum_sums = np.cumsum(counts * bin_values)
+    mean_near, mean_far = bin_values[0], bin_values[-1]
+    split = -1
+    for _ in range(max_iter):
+        threshold = (mean_near + mean_far) / 2
+        new_split = int(np.searchsorted(bin_values, threshold, side="right")) - 1
+        if new_split == split:
+            break
+        split = new_split
+        mean_near = cum_sums[split] / cum_counts[split]
+        mean_far = (cum_sums[-1] - cum_sums[split]) / (cum_counts[-1] - cum_counts[split])
+
+    return np.asarray(depth_values) <= bin_values[split]
+
+
+def split_kmeans(depth_values):
+    """
+    Referenzverfahren: KMeans-Clustering mit k=2 (sklearn wird erst bei Bedarf importiert).
+
+    :param depth_values: 1D-Array der gültigen Tiefenwerte.
+    :return: Boolesche Maske des näheren Clusters.
+    """
+    from sklearn.cluster import KMeans
+
+    kmeans = KMeans(n_clusters=2, random_state=0).fit(np.asarray(depth_values, dtype=np.float64).reshape(-1, 1))
+    return kmeans.labels_ == kmeans.cluster_centers_.argmin()
+
+
+FOREGROUND_METHODS = {
+    "otsu": split_otsu,
+    "two_means": split_two_means,
+    "kmeans": split_kmeans,
+}
@@ -0,0 +1,139 @@
+import threading, time
+import cv2
+
+class DetectionWorker:
+    """
+    Diese Klasse führt das aktuell gewählte YOLO-Modell fortlaufend auf dem Live-Bild der Kamera aus.
+
+    Funktionen:
+    - Ein Hintergrund-Thread nimmt jeweils das neueste Bild aus dem Ringpuffer der Kamera und verwirft
+      ältere Bilder, sodass die Inferenz in ihrem eigenen Takt läuft (z.B. 5-10 FPS auf der CPU).
+    - Die zuletzt erkannten Objekte werden als Liste bereitgestellt (z.B. für eine JSON-Route).
+    - draw() zeichnet die letzten Bounding-Boxen in ein beliebiges Kamerabild, der Kamerastream
+      selbst bleibt dadurch bei voller Bildrate.
+    - Der Thread startet bei Bedarf und beendet sich, wenn längere Zeit niemand die Ergebnisse abruft.
+    """
+    def __init__(self, camera, get_model=None, get_model_name=None, confidence_threshold=0.5, idle_timeout=5.0):
+        """
+        Initialisiert den Detektions-Worker.
+
+        Args:
+            camera (Camera): Kamerainstanz mit Ringpuffer und geladenem YOLO-Modell.
+            get_model (callable, optional): Liefert das aktuell gewählte Modell (z.B. YOLOModelController.get_model).
+                Ohne Angabe wird das Modell der Kamera (Modell des letzten Scans) verwendet.
+            get_model_name (callable, optional): Liefert den Namen des gewählten Modells für das Ergebnis.
+            confidence_threshold (float): Mindestkonfidenz für angezeigte Detektionen.
+            idle_timeout (float): Sekunden ohne Abruf, nach denen der Thread pausiert.
+        """
+        self.camera = camera
+        self.get_model = get_model
+        self.get_model_name = get_model_name
+        self.confidence_threshold = confidence_threshold
+        self.idle_timeout = idle_timeout
+
+        self.lock = threading.Lock()
+        self.thread = None
+        self.last_access = 0.0
+        self.result = {
+            "detections": [],
+            "frame_number": 0,
+            "timestamp": None,
+            "inference_ms": None,
+            "model": None
+        }
+
+    def touch(self):
+        """Markiert die Ergebnisse als angefragt und startet den Thread bei Bedarf."""
+        with self.lock:
+            self.last_access = time.time()
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="detection-worker", daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        """Inferenz-Schleife: immer nur das neueste Bild verarbeiten."""
+        last_frame_number = 0
+        while True:
+            with self.lock:
+                if time.time() - self.last_access > self.idle_timeout:
+                    self.thread = None
+                    return
+
+            frame = self.camera.wait_for_frame(last_frame_number, timeout=1.0)
+            if frame is None:
+                if not self.camera.grabber_running:
+                    time.sleep(0.2) # Kamera getrennt --> nicht im Leerlauf drehen
+                continue
+            last_frame_number = frame.frame_number
+
+            try:
+                start = time.perf_counter()
+                with self.camera.model_lock:
+                    if self.get_model is not None:
+                        model = self.get_model()
+                        model_name = self.get_model_name() if self.get_model_name is not None else None
+                    else:
+                        model, model_name = self.camera.model, self.camera.current_model_path
+                    results = model(frame.color, verbose=False)
+                inference_ms = 1000 * (time.perf_counter() - start)
+            except Exception as e:
+                print(f"[FEHLER] Live-Detektion fehlgeschlagen: {e}")
+                time.sleep(0.5)
+                continue
+
+            detections = []
+            for box in results[0].boxes:
+                conf = float(box.conf[0])
+                if conf < self.confidence_threshold:
+                    continue
+                x1, y1, x2, y2 = [int(v) for v in box.xyxy[0].tolist()]
+                detections.append({
+                    "class_name": results[0].names[int(box.cls[0])],
+                    "confidence": round(conf, 4),
+                    "bbox": [x1, y1, x2, y2]
+                })
+
+            with self.lock:
+                self.result = {
+                    "detections": detections,
+                    "frame_number": frame.frame_number,
+                    "timestamp": frame.timestamp,
+                    "inference_ms": round(inference_ms, 1),
+                    "model": model_name
+                }
+
+    def get_result(self):
+        """
+        Liefert das Ergebnis der letzten Inferenz.
+
+        Returns:
+            dict: detections (Liste mit class_name, confidence, bbox), frame_number, timestamp,
+                  inference_ms und model.
+        """
+        self.touch()
+        with self.lock:
+            return self.result
+
+    def draw(self, frame):
+        """
+        Zeichnet die zuletzt erkannten Objekte in eine Kopie des Farbbildes.
+        Wird als Render-Funktion für den MJPEG-Stream genutzt.
+
+        Args:
+            frame (CameraFrame): Aktuelles Bildpaar aus dem Ringpuffer.
+
+        Returns:
+            np.ndarray: BGR-Bild mit Bounding-Boxen und Labels.
+        """
+        result = self.get_result()
+        image = frame.color.copy()
+        for detection in result["detections"]:
+            x1, y1, x2, y2 = detection["bbox"]
+            cv2.rectangle(image, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            label = f"{detection['class_name']}: {detection['confidence']:.2f}"
+            cv2.putText(image, label, (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX,
+                        0.5, (0, 255, 0), 2)
+        if result["inference_ms"] is not None:
+            cv2.putText(image, f"YOLO: {result['inference_ms']:.0f} ms", (10, 25), cv2.FONT_HERSHEY_SIMPLEX,
+                        0.7, (0, 255, 0), 2)
+        return image
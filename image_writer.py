@@ -0,0 +1,96 @@
+import os, queue, threading
+import cv2
+
+# Dateiendung und Qualitätsparameter je Codec (PNG: Kompressionsstufe 0-9, JPEG/WebP: Qualität 0-100)
+IMAGE_CODECS = {
+    "png": (".png", cv2.IMWRITE_PNG_COMPRESSION),
+    "jpg": (".jpg", cv2.IMWRITE_JPEG_QUALITY),
+    "webp": (".webp", cv2.IMWRITE_WEBP_QUALITY),
+}
+
+
+class ImageWriter:
+    """
+    Diese Klasse speichert Bilder asynchron auf der Festplatte.
+
+    Funktionen:
+    - submit() legt ein Bild in eine Warteschlange und kehrt sofort zurück; ein Hintergrund-Thread
+      kodiert und schreibt die Bilder, sodass das Kodieren nie die Auswertung eines Scan-Halts verzögert.
+    - Codec und Qualität sind einstellbar (PNG verlustfrei, JPEG/WebP deutlich kleiner).
+    - Dateien werden zunächst unter einem temporären Namen geschrieben und dann umbenannt,
+      damit nie halb geschriebene Bilder (z.B. über /scan_images) ausgeliefert werden.
+    - flush() wartet, bis alle ausstehenden Bilder geschrieben sind (z.B. am Ende eines Scans).
+    """
+    def __init__(self, codec="jpg", quality=85, max_queue=32):
+        """
+        Initialisiert den Bildschreiber.
+
+        Args:
+            codec (str): "png", "jpg" oder "webp".
+            quality (int): JPEG/WebP-Qualität (0-100) bzw. PNG-Kompressionsstufe (0-9).
+            max_queue (int): Maximale Anzahl wartender Bilder (bei voller Warteschlange wartet submit()).
+        """
+        if codec not in IMAGE_CODECS:
+            raise ValueError(f"Unbekannter Bild-Codec '{codec}'. Verfügbar: {', '.join(IMAGE_CODECS)}")
+        self.codec = codec
+        self.quality = quality
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.lock = threading.Lock()
+        self.thread = None
+        self.errors = 0
+
+    @property
+    def extension(self):
+        """Dateiendung des eingestellten Codecs (z.B. ".jpg")."""
+        return IMAGE_CODECS[self.codec][0]
+
+    def _ensure_worker(self):
+        """Startet den Schreib-Thread, falls er nicht bereits läuft."""
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="image-writer", daemon=True)
+                self.thread.start()
+
+    def submit(self, path, image, codec=None, quality=None):
+        """
+        Legt ein Bild zum Speichern in die Warteschlange.
+        Das Bild darf danach nicht mehr verändert werden (es wird nicht kopiert).
+
+        Args:
+            path (str): Zielpfad (die Endung sollte zum Codec passen, siehe `extension`).
+            image (np.ndarray): BGR-Bild.
+            codec (str, optional): Abweichender Codec für dieses Bild (z.B. "png" für Rohbilder).
+            quality (int, optional): Abweichende Qualität für dieses Bild.
+        """
+        codec = codec or self.codec
+        if codec not in IMAGE_CODECS:
+            raise ValueError(f"Unbekannter Bild-Codec '{codec}'. Verfügbar: {', '.join(IMAGE_CODECS)}")
+        if quality is None:
+            quality = self.quality if codec == self.codec else None
+        self._ensure_worker()
+        self.queue.put((path, image, codec, quality))
+
+    def _run(self):
+        """Schreib-Schleife: kodiert und speichert Bilder in der Reihenfolge ihres Eingangs."""
+        while True:
+            path, image, codec, quality = self.queue.get()
+            try:
+                extension, flag = IMAGE_CODECS[codec]
+                params = [int(flag), int(quality)] if quality is not None else []
+                ret, buffer = cv2.imencode(extension, image, params)
+                if not ret:
+                    raise RuntimeError("Kodierung fehlgeschlagen")
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                tmp_path = path + ".tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(buffer.tobytes())
+                os.replace(tmp_path, path)
+            except Exception as e:
+                self.errors += 1
+                print(f"[FEHLER] Bild {path} konnte nicht gespeichert werden: {e}")
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Wartet, bis alle ausstehenden Bilder geschrieben sind."""
+        self.queue.join()
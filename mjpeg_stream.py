@@ -0,0 +1,198 @@
+import threading, time
+import cv2
+
+class MJPEGBroadcaster:
+    """
+    Diese Klasse verteilt einen Kamerastream als MJPEG an beliebig viele HTTP-Clients.
+
+    Funktionen:
+    - Ein Hintergrund-Thread je Stream liest neue Bilder aus dem Ringpuffer der Kamera,
+      bereitet sie auf (z.B. Colorizer) und kodiert jedes Bild genau einmal als JPEG.
+    - Alle Clients erhalten dieselben JPEG-Bytes. Ist ein Client langsamer als der Stream,
+      werden Zwischenbilder übersprungen und immer das neueste Bild gesendet (drop-to-latest).
+    - Die Bildrate ist über `max_fps` begrenzt; ohne Clients pausiert der Thread.
+    """
+    def __init__(self, camera, render=None, max_fps=30, jpeg_quality=80, width=None, name="mjpeg"):
+        """
+        Initialisiert den Broadcaster.
+
+        Args:
+            camera (Camera): Kamerainstanz mit Ringpuffer (wait_for_frame, grabber_running).
+            render (callable, optional): Funktion CameraFrame -> BGR-Bild (Standard: Farbbild).
+            max_fps (float): Maximale Bildrate des Streams.
+            jpeg_quality (int): JPEG-Qualität (0-100).
+            width (int, optional): Zielbreite in Pixeln; kleinere Bilder werden nicht vergrößert (None = Originalgröße).
+            name (str): Name des Streams (Threadname und Logausgaben).
+        """
+        self.camera = camera
+        self.render = render or (lambda frame: frame.color)
+        self.max_fps = max_fps
+        self.jpeg_quality = jpeg_quality
+        self.width = width
+        self.name = name
+
+        self.condition = threading.Condition()
+        self.jpeg = None         # zuletzt kodiertes Bild
+        self.sequence = 0        # fortlaufende Nummer des kodierten Bildes
+        self.subscribers = 0
+        self.thread = None
+
+    def _ensure_worker(self):
+        """Startet den Kodier-Thread, falls er nicht bereits läuft (Aufruf unter self.condition)."""
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name=f"{self.name}-broadcaster", daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        """Kodier-Schleife: Ein JPEG je neuem Kamerabild, höchstens `max_fps` pro Sekunde."""
+        last_frame_number = 0
+        last_sent = 0.0
+        while True:
+            with self.condition:
+                if self.subscribers == 0:
+                    self.thread = None
+                    self.jpeg = None # kein veraltetes Bild an spätere Clients senden
+                    return
+
+            # FPS-Begrenzung
+            min_interval = 1.0 / self.max_fps if self.max_fps else 0.0
+            wait = last_sent + min_interval - time.time()
+            if wait > 0:
+                time.sleep(wait)
+
+            frame = self.camera.wait_for_frame(last_frame_number, timeout=1.0)
+            if frame is None:
+                if not self.camera.grabber_running:
+                    time.sleep(0.2) # Kamera getrennt --> nicht im Leerlauf drehen
+                continue
+            last_frame_number = frame.frame_number
+
+            try:
+                image = self.render(frame)
+                if self.width and image.shape[1] > self.width:
+                    height = round(image.shape[0] * self.width / image.shape[1])
+                    image = cv2.resize(image, (self.width, height), interpolation=cv2.INTER_AREA)
+                ret, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), int(self.jpeg_quality)])
+            except Exception as e:
+                print(f"[FEHLER] Bild für Stream '{self.name}' konnte nicht kodiert werden: {e}")
+                continue
+            if not ret:
+                continue
+            last_sent = time.time()
+
+            with self.condition:
+                self.jpeg = buffer.tobytes()
+                self.sequence += 1
+                self.condition.notify_all()
+
+    def stream(self):
+        """
+        Generator für eine Flask-Response (multipart/x-mixed-replace).
+        Jeder Client wartet nur auf das nächste bereits kodierte Bild.
+        """
+        with self.condition:
+            self.subscribers += 1
+            self._ensure_worker()
+            # vorhandenes Bild sofort senden, sonst auf das nächste warten
+            last_sequence = self.sequence - 1 if self.jpeg is not None else self.sequence
+        try:
+            while True:
+                with self.condition:
+                    self.condition.wait_for(lambda: self.sequence > last_sequence, timeout=1.0)
+                    if self.sequence <= last_sequence:
+                        jpeg = None
+                    else:
+                        jpeg, last_sequence = self.jpeg, self.sequence
+                if jpeg is None:
+                    if not self.camera.grabber_running:
+                        break
+                    continue
+                yield (b'--frame\r\n'
+                       b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+        finally:
+            with self.condition:
+                self.subscribers -= 1
+
+
+# Serverseitige Vorgaben für die Stream-Profile: Anfragen werden auf diese Stufen gerundet,
+# damit Clients mit ähnlichen Wünschen denselben Broadcaster (und dieselbe Kodierung) teilen.
+STREAM_WIDTHS = (320, 480, 640, 960, 1280)
+STREAM_QUALITIES = (30, 50, 70, 80, 90)
+STREAM_FPS = (5, 10, 15, 30)
+
+
+def _snap(value, steps, default):
+    """Rundet `value` auf die nächstgelegene erlaubte Stufe; ungültige Werte ergeben `default`."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return default
+    return min(steps, key=lambda step: abs(step - value))
+
+
+class MJPEGStreamHub:
+    """
+    Verwaltet je Stream (z.B. "rgb", "depth") und Profil (Breite, Qualität, FPS) genau einen MJPEGBroadcaster.
+
+    Funktionen:
+    - Übersetzt die Query-Parameter `width`, `quality` und `fps` einer Anfrage in ein erlaubtes Profil.
+    - Erzeugt Broadcaster bei Bedarf und teilt sie zwischen allen Clients mit demselben Profil,
+      sodass Skalierung und JPEG-Kodierung je Profil nur einmal pro Bild anfallen.
+    """
+    def __init__(self, camera, renderers, default_profiles=None):
+        """
+        Initialisiert den Hub.
+
+        Args:
+            camera (Camera): Kamerainstanz mit Ringpuffer.
+            renderers (dict): Stream-Name -> Funktion CameraFrame -> BGR-Bild.
+            default_profiles (dict, optional): Stream-Name -> Standardprofil {"width", "quality", "fps"}.
+        """
+        self.camera = camera
+        self.renderers = renderers
+        self.default_profiles = default_profiles or {}
+        self.broadcasters = {}
+        self.lock = threading.Lock()
+
+    def resolve_profile(self, stream, args):
+        """
+        Wendet die serverseitigen Vorgaben auf die angefragten Parameter an.
+
+        Args:
+            stream (str): Name des Streams.
+            args (dict): Query-Parameter der Anfrage (width, quality, fps).
+
+        Returns:
+            tuple: (width, quality, fps) des zu verwendenden Profils.
+        """
+        default = {"width": 1280, "quality": 80, "fps": 30}
+        default.update(self.default_profiles.get(stream, {}))
+        width = _snap(args.get("width"), STREAM_WIDTHS, default["width"])
+        quality = _snap(args.get("quality"), STREAM_QUALITIES, default["quality"])
+        fps = _snap(args.get("fps"), STREAM_FPS, default["fps"])
+        return int(width), int(quality), int(fps)
+
+    def get(self, stream, args=None):
+        """
+        Liefert den Broadcaster für Stream und Profil (wird beim ersten Aufruf erzeugt).
+
+        Args:
+            stream (str): Name des Streams.
+            args (dict, optional): Query-Parameter der Anfrage.
+
+        Returns:
+            MJPEGBroadcaster: Gemeinsamer Broadcaster des Profils.
+        """
+        width, quality, fps = self.resolve_profile(stream, args or {})
+        key = (stream, width, quality, fps)
+        with self.lock:
+            if key not in self.broadcasters:
+                self.broadcasters[key] = MJPEGBroadcaster(
+                    self.camera,
+                    render=self.renderers[stream],
+                    max_fps=fps,
+                    jpeg_quality=quality,
+                    width=width,
+                    name=f"{stream}-{width}w-q{quality}-{fps}fps"
+                )
+            return self.broadcasters[key]
@@ -29,6 +29,14 @@ class NavBar:
                 placeholder="Modell wählen...",
                 clearable=False,
                 style={"width": "200px", "color": "black"}   
+            ),
+            # Inferenz-Backend des Modells (PyTorch/ONNX/OpenVINO) inkl. gemessener Inferenzzeit
+            dcc.Dropdown(
+                id="yolo-backend-dropdown",
+                options=[{"label": "PyTorch", "value": "pytorch"}],
+                value="pytorch",
+                clearable=False,
+                style={"width": "200px", "color": "black", "marginTop": "0.3rem"}
             )
         ], style={"padding": "0.5rem"})
 
@@ -0,0 +1,144 @@
+import itertools, threading, time
+
+
+class JobCancelled(Exception):
+    """Wird in einer Hintergrundaufgabe ausgelöst, wenn der Bediener sie abgebrochen hat."""
+
+
+class RobotJob:
+    """
+    Eine Hintergrundaufgabe des Roboters (Scan oder Pick & Place).
+
+    Attribute:
+        id (int): Fortlaufende Job-ID.
+        kind (str): Art der Aufgabe (z.B. "scan", "place").
+        status (str): "running", "done", "failed" oder "cancelled".
+        progress (dict): Letzter Fortschritt (z.B. stage, angle, step, detections).
+        result: Rückgabewert der Aufgabe (bei status "done").
+        error (str): Fehlermeldung (bei status "failed").
+    """
+    def __init__(self, job_id, kind):
+        self.id = job_id
+        self.kind = kind
+        self.status = "running"
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        """Gibt an, ob ein Abbruch angefordert wurde."""
+        return self.cancel_event.is_set()
+
+    def raise_if_cancelled(self):
+        """Löst JobCancelled aus, falls ein Abbruch angefordert wurde (zwischen zwei Bewegungen aufrufen)."""
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def report(self, **progress):
+        """Aktualisiert den Fortschritt (nur die übergebenen Felder)."""
+        with self.lock:
+            self.progress.update(progress)
+
+    def snapshot(self):
+        """
+        Liefert den aktuellen Zustand der Aufgabe.
+
+        Returns:
+            dict: id, kind, status, progress, elapsed (s), error.
+        """
+        with self.lock:
+            end = self.finished_at or time.time()
+            return {
+                "id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "progress": dict(self.progress),
+                "elapsed": round(end - self.started_at, 1),
+                "error": self.error
+            }
+
+
+class RobotJobRunner:
+    """
+    Diese Klasse führt lange Roboteraufgaben in einem Hintergrund-Thread aus.
+
+    Funktionen:
+    - Der Dash-Callback startet nur die Aufgabe und erhält eine Job-ID, der Flask-Worker ist sofort wieder frei.
+    - Die Oberfläche fragt den Fortschritt per dcc.Interval ab (Stufe, Winkel, bisherige Detektionen, Laufzeit).
+    - Es läuft höchstens eine Aufgabe gleichzeitig, da sich alle den Roboter teilen.
+    - Abbruch: cancel() setzt ein Flag, die Aufgabe beendet sich am nächsten Prüfpunkt (JobCancelled).
+    """
+    def __init__(self, max_finished=16):
+        """
+        Initialisiert den Job-Runner.
+
+        Args:
+            max_finished (int): Anzahl abgeschlossener Aufgaben, die zum Abruf des Ergebnisses aufbewahrt werden.
+        """
+        self.max_finished = max_finished
+        self.jobs = {}            # Job-ID -> RobotJob
+        self.active = None        # aktuell laufende Aufgabe
+        self.counter = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def start(self, kind, target, *args, **kwargs):
+        """
+        Startet eine Aufgabe im Hintergrund. `target` erhält den RobotJob als erstes Argument.
+
+        Args:
+            kind (str): Art der Aufgabe.
+            target (callable): Funktion target(job, *args, **kwargs).
+
+        Returns:
+            RobotJob | None: Neue Aufgabe oder None, falls bereits eine Aufgabe läuft.
+        """
+        with self.lock:
+            if self.active is not None and self.active.status == "running":
+                return None
+            job = RobotJob(next(self.counter), kind)
+            self.jobs[job.id] = job
+            self.active = job
+            # alte abgeschlossene Aufgaben verwerfen
+            finished = [j for j in self.jobs.values() if j.status != "running"]
+            for old in finished[:max(0, len(finished) - self.max_finished)]:
+                del self.jobs[old.id]
+
+        def run():
+            try:
+                result = target(job, *args, **kwargs)
+                status, error = "done", None
+            except JobCancelled:
+                result, status, error = None, "cancelled", None
+                print(f"[INFO] Aufgabe {job.id} ({kind}) abgebrochen.")
+            except Exception as e:
+                result, status, error = None, "failed", str(e)
+                print(f"[FEHLER] Aufgabe {job.id} ({kind}) fehlgeschlagen: {e}")
+            with job.lock:
+                job.result, job.status, job.error = result, status, error
+                job.finished_at = time.time()
+        threading.Thread(target=run, name=f"robot-job-{job.id}", daemon=True).start()
+        return job
+
+    def get(self, job_id):
+        """Liefert die Aufgabe zu einer Job-ID oder None."""
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job_id=None):
+        """
+        Fordert den Abbruch einer Aufgabe an (Standard: laufende Aufgabe).
+
+        Returns:
+            bool: True, falls eine laufende Aufgabe gefunden wurde.
+        """
+        with self.lock:
+            job = self.jobs.get(job_id) if job_id is not None else self.active
+        if job is None or job.status != "running":
+            return False
+        job.cancel_event.set()
+        return True
@@ -0,0 +1,148 @@
+import threading
+from collections import OrderedDict
+
+
+class ScanResult:
+    """
+    Ergebnis eines Scans im Speicher des Servers.
+
+    Attribute:
+        df: DataFrame des Scans (Spalte "id" = Objektnummer im Scan).
+        ids: Objektnummern als Strings (Werte der Dropdowns), gleiche Reihenfolge wie df.
+        rows: Objektnummer (String) -> Zeilenindex in df.
+    """
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        self.ids = self.df["id"].astype(str).tolist()
+        self.rows = {object_id: row for row, object_id in enumerate(self.ids)}
+
+    def column(self, name):
+        """Liefert eine Spalte als NumPy-Array."""
+        return self.df[name].to_numpy()
+
+    def position(self, object_id):
+        """
+        Liefert die Position eines Objekts.
+
+        Args:
+            object_id (str): Objektnummer im Scan.
+
+        Returns:
+            tuple | None: (X, Y) oder None, falls die Nummer nicht existiert.
+        """
+        row = self.rows.get(str(object_id))
+        if row is None:
+            return None
+        return float(self.df.at[row, "X"]), float(self.df.at[row, "Y"])
+
+
+class ScanCache:
+    """
+    Serverseitiger Zwischenspeicher für Scan-Ergebnisse.
+
+    Funktionen:
+    - Der Browser (dcc.Store) hält nur eine kleine Referenz {"scan_id", "version"}, die Tabelle liegt auf dem Server.
+    - Callbacks lesen Spalten direkt aus dem gespeicherten DataFrame, statt die Tabelle bei jedem Aufruf
+      aus JSON neu aufzubauen.
+    - Änderungen (z.B. neue Position nach Pick & Place) erhöhen die Version, damit abhängige Callbacks neu zeichnen.
+    - Fehlt ein Scan im Speicher (z.B. nach Neustart des Servers), wird er über `loader` aus der Datenbank geladen.
+    - Positionsänderungen werden zuerst über `writer` in der Datenbank gespeichert; der Zwischenspeicher ist nie
+      die einzige Kopie einer Position, die der Roboter anfährt.
+    """
+    def __init__(self, loader=None, writer=None, max_entries=8):
+        """
+        Initialisiert den Zwischenspeicher.
+
+        Args:
+            loader (callable, optional): Funktion scan_id -> pd.DataFrame (z.B. MySQLManager.read_objects).
+            writer (callable, optional): Funktion (scan_id, Objektnummer, x, y) zum Speichern einer neuen Position
+                                         (z.B. MySQLManager.update_object_position).
+            max_entries (int): Maximale Anzahl gespeicherter Scans (zuletzt genutzte bleiben erhalten).
+        """
+        self.loader = loader
+        self.writer = writer
+        self.max_entries = max_entries
+        self.entries = OrderedDict() # scan_id -> [ScanResult, version]
+        self.lock = threading.Lock()
+
+    def put(self, scan_id, df):
+        """
+        Legt das Ergebnis eines Scans ab.
+
+        Args:
+            scan_id (int): ID des Scans in der Datenbank.
+            df (pd.DataFrame): Objekte des Scans.
+
+        Returns:
+            dict: Referenz für dcc.Store.
+        """
+        with self.lock:
+            self.entries[scan_id] = [ScanResult(df), 0]
+            self.entries.move_to_end(scan_id)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return {"scan_id": scan_id, "version": 0}
+
+    def get(self, ref):
+        """
+        Liefert das Scan-Ergebnis zu einer Referenz aus dcc.Store.
+
+        Args:
+            ref (dict): {"scan_id", "version"} oder leer.
+
+        Returns:
+            ScanResult | None: Ergebnis oder None, falls kein (nicht leerer) Scan vorliegt.
+        """
+        if not isinstance(ref, dict) or ref.get("scan_id") is None:
+            return None
+        scan_id = ref["scan_id"]
+        with self.lock:
+            entry = self.entries.get(scan_id)
+            if entry is not None:
+                self.entries.move_to_end(scan_id)
+                return entry[0] if not entry[0].df.empty else None
+
+        if self.loader is None:
+            return None
+        try:
+            df = self.loader(scan_id)
+        except Exception as e:
+            print(f"[FEHLER] Scan {scan_id} konnte nicht aus der Datenbank geladen werden: {e}")
+            return None
+        self.put(scan_id, df)
+        return self.get(ref)
+
+    def update_position(self, ref, object_id, x, y):
+        """
+        Speichert die Position eines Objekts (z.B. nach Pick & Place) in der Datenbank, übernimmt sie in den
+        Zwischenspeicher und erhöht die Version.
+
+        Args:
+            ref (dict): Referenz aus dcc.Store.
+            object_id (str): Objektnummer im Scan.
+            x (float): Neue X-Koordinate.
+            y (float): Neue Y-Koordinate.
+
+        Returns:
+            dict: Neue Referenz für dcc.Store.
+        """
+        result = self.get(ref)
+        if result is None:
+            return ref
+        if self.writer is not None:
+            try:
+                self.writer(ref["scan_id"], object_id, x, y)
+            except Exception as e:
+                print(f"[FEHLER] Neue Position von Objekt {object_id} konnte nicht gespeichert werden: {e}")
+        with self.lock:
+            row = result.rows.get(str(object_id))
+            if row is not None:
+                result.df.at[row, "X"] = x
+                result.df.at[row, "Y"] = y
+            entry = self.entries.get(ref["scan_id"])
+            if entry is None:
+                # zwischenzeitlich verdrängt --> beim nächsten get() mit der gespeicherten Position neu laden
+                return {"scan_id": ref["scan_id"], "version": ref.get("version", 0) + 1}
+            entry[1] = max(entry[1], ref.get("version", 0)) + 1
+            return {"scan_id": ref["scan_id"], "version": entry[1]}
+
@@ -0,0 +1,80 @@
+"""
+Zusammenführung der Beobachtungen eines Scans zu eindeutigen Objekten (Multi-View-Fusion).
+
+Benachbarte Scan-Halte sehen dasselbe Objekt oft mehrfach. Beobachtungen derselben Objektart, deren
+Position (X, Y) in beiden Achsen höchstens `radius` vom bisherigen Objekt abweicht, werden zu einem Objekt
+zusammengefasst:
+- Position: konfidenzgewichteter Mittelwert aller Beobachtungen.
+- Confidence und Metadaten (Bild, Gelenkstellung): von der besten Beobachtung.
+- Beobachtungen: Anzahl der zusammengefassten Beobachtungen.
+
+Die Suche nach Nachbarn läuft über ein Gitter mit Zellgröße `radius` je Objektart, sodass für jede
+Beobachtung nur die 3x3 umliegenden Zellen geprüft werden (lineare statt quadratischer Laufzeit).
+"""
+import math
+from collections import defaultdict
+
+
+def _cell(x, y, radius):
+    """Gitterzelle eines Punktes."""
+    return math.floor(x / radius), math.floor(y / radius)
+
+
+def fuse_observations(observations, radius=0.1):
+    """
+    Fasst Beobachtungen zu Objekten zusammen.
+
+    :param observations: Liste von Dictionaries mit mindestens "X", "Y", "Objektart" und "Confidence"
+                         (weitere Felder werden von der besten Beobachtung übernommen).
+    :param radius: Maximale Abweichung in X und Y (Meter), bis zu der zwei Beobachtungen als dasselbe Objekt gelten.
+    :return: Liste der Objekte (Dictionaries wie die Eingabe, zusätzlich "Beobachtungen"),
+             sortiert in der Reihenfolge ihrer ersten Aufnahme.
+    """
+    # Beste Beobachtungen zuerst: sie bilden die Objekte, schwächere werden ihnen zugeordnet
+    order = sorted(range(len(observations)), key=lambda i: -observations[i]["Confidence"])
+
+    objects = []                 # je Objekt: [Summe w*x, Summe w*y, Summe w, Anzahl, beste Beobachtung, erster Index]
+    grid = defaultdict(list)     # (Objektart, Zelle) -> Indizes in objects
+    for i in order:
+        obs = observations[i]
+        x, y, class_name = obs["X"], obs["Y"], obs["Objektart"]
+        weight = max(float(obs["Confidence"]), 1e-6)
+        cx, cy = _cell(x, y, radius)
+
+        # nächstgelegenes Objekt derselben Art in den umliegenden Zellen suchen
+        match, match_distance = None, None
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for k in grid[(class_name, cx + dx, cy + dy)]:
+                    sum_x, sum_y, sum_w = objects[k][:3]
+                    ox, oy = sum_x / sum_w, sum_y / sum_w
+                    distance = max(abs(x - ox), abs(y - oy))
+                    if distance <= radius and (match is None or distance < match_distance):
+                        match, match_distance = k, distance
+
+        if match is None:
+            objects.append([weight * x, weight * y, weight, 1, obs, i])
+            grid[(class_name, cx, cy)].append(len(objects) - 1)
+            continue
+
+        # Beobachtung übernehmen; verschiebt sich der Mittelpunkt in eine andere Zelle, Index nachführen
+        fused = objects[match]
+        old_cell = _cell(fused[0] / fused[2], fused[1] / fused[2], radius)
+        fused[0] += weight * x
+        fused[1] += weight * y
+        fused[2] += weight
+        fused[3] += 1
+        fused[5] = min(fused[5], i)
+        new_cell = _cell(fused[0] / fused[2], fused[1] / fused[2], radius)
+        if new_cell != old_cell:
+            grid[(class_name,) + old_cell].remove(match)
+            grid[(class_name,) + new_cell].append(match)
+
+    result = []
+    for sum_x, sum_y, sum_w, count, best, first_index in sorted(objects, key=lambda o: o[5]):
+        fused = dict(best)
+        fused["X"] = round(sum_x / sum_w, 5)
+        fused["Y"] = round(sum_y / sum_w, 5)
+        fused["Beobachtungen"] = count
+        result.append(fused)
+    return result
@@ -0,0 +1,126 @@
+import os, threading
+from collections import OrderedDict
+import cv2
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+MIMETYPES = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp"}
+
+
+class ScanImageStore:
+    """
+    Diese Klasse stellt die Scanbilder über eine eigene Flask-Route bereit.
+
+    Funktionen:
+    - Listet die Scanbilder eines Verzeichnisses (Dateiname + Änderungszeit) ohne sie zu lesen.
+    - Erzeugt verkleinerte JPEG-Vorschaubilder bei der ersten Anfrage und hält sie im Speicher (LRU),
+      Schlüssel ist (Dateiname, Änderungszeit) --> ein überschriebenes Bild erhält automatisch ein neues Vorschaubild.
+    - Die URLs enthalten die Änderungszeit, der Browser darf die Bilder daher dauerhaft zwischenspeichern.
+    - Es werden nur Dateien direkt im Scan-Verzeichnis ausgeliefert (kein Zugriff auf andere Pfade).
+    """
+    def __init__(self, folder="Scans/makro", route="/scan_images", thumb_width=480, jpeg_quality=75, max_entries=256):
+        """
+        Initialisiert den Bildspeicher.
+
+        Args:
+            folder (str): Verzeichnis der Scanbilder.
+            route (str): URL-Präfix der Flask-Route.
+            thumb_width (int): Breite der Vorschaubilder in Pixeln.
+            jpeg_quality (int): JPEG-Qualität der Vorschaubilder (0-100).
+            max_entries (int): Maximale Anzahl zwischengespeicherter Vorschaubilder.
+        """
+        self.folder = folder
+        self.route = route
+        self.thumb_width = thumb_width
+        self.jpeg_quality = jpeg_quality
+        self.max_entries = max_entries
+        self.thumbnails = OrderedDict() # (Dateiname, mtime_ns) -> JPEG-Bytes
+        self.lock = threading.Lock()
+
+    def list_images(self):
+        """
+        Listet die Scanbilder sortiert nach Dateiname.
+
+        Returns:
+            list: Tupel (Dateiname, mtime_ns).
+        """
+        if not os.path.isdir(self.folder):
+            return []
+        images = []
+        for entry in os.scandir(self.folder):
+            if entry.is_file() and entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                try:
+                    images.append((entry.name, entry.stat().st_mtime_ns))
+                except OSError: # zwischenzeitlich gelöscht (z.B. neuer Scan)
+                    continue
+        return sorted(images)
+
+    def resolve(self, filename):
+        """
+        Liefert den Pfad eines Scanbildes oder None, falls der Name ungültig ist oder die Datei fehlt.
+
+        Args:
+            filename (str): Dateiname (ohne Verzeichnis).
+        """
+        if filename != os.path.basename(filename) or not filename.lower().endswith(IMAGE_EXTENSIONS):
+            return None
+        path = os.path.join(self.folder, filename)
+        return path if os.path.isfile(path) else None
+
+    def mimetype(self, filename):
+        """MIME-Typ des Originalbildes."""
+        return MIMETYPES.get(os.path.splitext(filename)[1].lower(), "application/octet-stream")
+
+    def thumbnail(self, filename):
+        """
+        Liefert das Vorschaubild eines Scanbildes (aus dem Zwischenspeicher oder neu erzeugt).
+
+        Args:
+            filename (str): Dateiname (ohne Verzeichnis).
+
+        Returns:
+            bytes | None: JPEG-Bytes oder None, falls das Bild nicht existiert oder nicht lesbar ist.
+        """
+        path = self.resolve(filename)
+        if path is None:
+            return None
+        try:
+            key = (filename, os.stat(path).st_mtime_ns)
+        except OSError: # zwischen resolve() und stat() gelöscht (z.B. durch einen neuen Scan)
+            return None
+        with self.lock:
+            jpeg = self.thumbnails.get(key)
+            if jpeg is not None:
+                self.thumbnails.move_to_end(key)
+                return jpeg
+
+        try:
+            image = cv2.imread(path, cv2.IMREAD_COLOR)
+        except OSError:
+            image = None
+        if image is None:
+            print(f"[FEHLER] Scanbild {filename} konnte nicht gelesen werden.")
+            return None
+        if image.shape[1] > self.thumb_width:
+            height = round(image.shape[0] * self.thumb_width / image.shape[1])
+            image = cv2.resize(image, (self.thumb_width, height), interpolation=cv2.INTER_AREA)
+        ret, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), int(self.jpeg_quality)])
+        if not ret:
+            return None
+        jpeg = buffer.tobytes()
+
+        with self.lock:
+            # ältere Versionen desselben Bildes verwerfen
+            for old_key in [k for k in self.thumbnails if k[0] == filename]:
+                del self.thumbnails[old_key]
+            self.thumbnails[key] = jpeg
+            while len(self.thumbnails) > self.max_entries:
+                self.thumbnails.popitem(last=False)
+        return jpeg
+
+    def thumbnail_url(self, filename, mtime_ns):
+        """URL des Vorschaubildes (versioniert über die Änderungszeit)."""
+        return f"{self.route}/thumb/{filename}?v={mtime_ns}"
+
+    def image_url(self, filename, mtime_ns):
+        """URL des Originalbildes (versioniert über die Änderungszeit)."""
+        return f"{self.route}/full/{filename}?v={mtime_ns}"
@@ -1,46 +1,133 @@
-import mysql.connector
-from mysql.connector import Error
+import os, queue, threading
+from datetime import datetime
+import pandas as pd
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
 
-class MySQLManager:
+# Zugangsdaten und Pool-Einstellungen der Datenbank (über Umgebungsvariablen anpassbar)
+# backend: "mysql" (MySQL-Server) oder "sqlite" (Datei, ohne Server)
+DB_CONFIG = {
+    "backend": os.environ.get("QARM_DB_BACKEND", "mysql"),
+    "sqlite_path": os.environ.get("QARM_DB_SQLITE_PATH", "objects.db"),
+    "host": os.environ.get("QARM_DB_HOST", "localhost"),
+    "port": int(os.environ.get("QARM_DB_PORT", 3306)),
+    "user": os.environ.get("QARM_DB_USER", "root"),
+    "password": os.environ.get("QARM_DB_PASSWORD", "123SA2"),
+    "database": os.environ.get("QARM_DB_NAME", "objects_db"),
+    "pool_size": int(os.environ.get("QARM_DB_POOL_SIZE", 5)),
+    "max_overflow": int(os.environ.get("QARM_DB_MAX_OVERFLOW", 5)),
+}
+
+# Aktuelle Version des Datenbankschemas (siehe MySQLManager._migrate)
+SCHEMA_VERSION = 3
+
+# Spaltenreihenfolge der Objekttabelle für Einfügeoperationen
+DATA_COLUMNS = ["Image", "X", "Y", "Z", "Y1", "Y2", "Y3", "Y4", "Y5", "Objektart", "Confidence", "Bild_Pfad", "Beobachtungen"]
+OBJECT_COLUMNS = ["scan_id", "Nr"] + DATA_COLUMNS
+OPTIONAL_COLUMNS = {"Beobachtungen": 1, "scan_id": None, "Nr": None}
+INSERT_OBJECT_QUERY = text(f"""
+    INSERT INTO objects ({", ".join(OBJECT_COLUMNS)})
+    VALUES ({", ".join(":" + column for column in OBJECT_COLUMNS)})
+""")
+
+# Objekte eines Scans in der Form der Oberfläche: "id" ist die Objektnummer innerhalb des Scans
+# (für Dropdowns und Sprachbefehle), die tabellenweite id bleibt unverändert
+SELECT_SCAN_QUERY = text(f"""
+    SELECT Nr AS id, {", ".join(DATA_COLUMNS)} FROM objects
+    WHERE scan_id = :scan_id ORDER BY Nr;
+""")
+
+
+def _now():
+    """Aktuelle Ortszeit als 'YYYY-MM-DD HH:MM:SS' (von MySQL und SQLite gleichermaßen akzeptiert)."""
+    return datetime.now().isoformat(sep=" ", timespec="seconds")
+
+
+def _object_row(object_data, scan_id=None):
+    """Wählt die Spalten der Objekttabelle aus einem Objekt-Dictionary aus (optionale Spalten mit Standardwert)."""
+    row = {column: object_data.get(column, OPTIONAL_COLUMNS[column]) if column in OPTIONAL_COLUMNS else object_data[column]
+           for column in OBJECT_COLUMNS}
+    if scan_id is not None:
+        row["scan_id"] = scan_id
+    return row
+
+
+class MySQLBackend:
     """
-    Verwaltung der MySQL-Datenbankverbindung und Datenoperationen für Objekterkennungsdaten.
-    Diese Klasse ermöglicht das Verbinden, Erstellen, Einfügen und Bereinigen von Datenbanken und Tabellen.
+    Speicher-Backend für einen MySQL-Server (Standard).
+    Pool mit pre-ping und Recycling, Datenbank und Tabellen werden bei Bedarf angelegt.
     """
+    name = "mysql"
+    clear_query = "TRUNCATE TABLE {table};"
 
-    def __init__(self, host="localhost", user="root", password="123SA2", database="objects_db"):
-        """
-        Initialisiert den MySQLManager mit Verbindungsdetails.
-
-        Args:
-            host (str): Hostadresse der Datenbank. Standard ist "localhost".
-            user (str): Benutzername für die MySQL-Datenbank.
-            password (str): Passwort für die MySQL-Datenbank.
-            database (str): Name der Datenbank (Standard: "objects_db").
-        """
+    def __init__(self, host, port, user, password, database, pool_size, max_overflow):
         self.host = host
+        self.port = port
         self.user = user
         self.password = password
         self.database = database
-        self.connection = None
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
 
-    def connect(self):
+    @classmethod
+    def from_config(cls, config):
+        """Erstellt das Backend aus einem Konfigurations-Dictionary (Schlüssel wie DB_CONFIG)."""
+        return cls(config["host"], config["port"], config["user"], config["password"], config["database"],
+                   config["pool_size"], config["max_overflow"])
+
+    def __str__(self):
+        return f"MySQL ({self.database}@{self.host}:{self.port})"
+
+    def _url(self, database=None):
+        """Erstellt die Verbindungs-URL (Sonderzeichen im Passwort werden korrekt maskiert)."""
+        return URL.create("mysql+mysqlconnector", username=self.user, password=self.password,
+                          host=self.host, port=self.port, database=database)
+
+    def create_engine(self):
+        """Legt die Datenbank an (falls nötig) und erstellt die Engine mit Verbindungspool."""
+        # Datenbank anlegen (einmalige Verbindung ohne Datenbankauswahl)
+        server_engine = create_engine(self._url(), poolclass=NullPool)
+        with server_engine.begin() as conn:
+            conn.execute(text(f"CREATE DATABASE IF NOT EXISTS {self.database};"))
+        server_engine.dispose()
+
+        return create_engine(
+            self._url(self.database),
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_pre_ping=True,   # tote Verbindungen vor der Nutzung erkennen
+            pool_recycle=3600     # Verbindungen vor dem MySQL-wait_timeout erneuern
+        )
+
+    def drop(self):
+        """Löscht die Datenbank samt aller Tabellen auf dem Server."""
+        server_engine = create_engine(self._url(), poolclass=NullPool)
+        with server_engine.begin() as conn:
+            conn.execute(text(f"DROP DATABASE IF EXISTS {self.database};"))
+        server_engine.dispose()
+
+    @staticmethod
+    def _has_column(conn, table, column):
+        """Prüft, ob eine Spalte in der aktuellen Datenbank existiert."""
+        return bool(conn.execute(text("""
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND COLUMN_NAME = :column;
+        """), {"table": table, "column": column}).scalar())
+
+    def migrate(self, conn, version):
         """
-        Verbindet sich mit der MySQL-Datenbank und erstellt bei Bedarf die Objekttabelle.
+        Bringt das Schema schrittweise von `version` auf SCHEMA_VERSION. Bereits vorhandene Daten bleiben erhalten.
 
-        Raises:
-            ConnectionError: Falls die Verbindung zur Datenbank fehlschlägt.
+        Versionen:
+            1: Objekttabelle (ursprüngliches Schema)
+            2: Spalte Beobachtungen (Anzahl zusammengeführter Beobachtungen je Objekt)
+            3: Tabelle scans, Spalten scan_id (Fremdschlüssel) und Nr (Objektnummer im Scan),
+               Index auf (scan_id, Objektart)
         """
-        try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password
-            )
-
-            cursor = self.connection.cursor()
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database};")
-            cursor.execute(f"USE {self.database};")
-            cursor.execute("""
+        if version < 1:
+            conn.execute(text("""
                 CREATE TABLE IF NOT EXISTS objects (
                     id INT AUTO_INCREMENT PRIMARY KEY,
                     Image VARCHAR(255),
@@ -50,16 +137,184 @@ class MySQLManager:
                     Confidence FLOAT,
                     Bild_Pfad VARCHAR(255)
                 );
-            """)
-            self.clear_table("objects")  # Falls die Tabelle nicht geleert werden soll -> auskommentieren
-            print("[INFO] MySQL-Datenbank und Tabelle erfolgreich eingerichtet.")
-        except Error as e:
-            if e.errno == 1045:  # MySQL-Fehlercode für falsches Passwort/Nutzername
+            """))
+        if version < 2 and not self._has_column(conn, "objects", "Beobachtungen"):
+            conn.execute(text("ALTER TABLE objects ADD COLUMN Beobachtungen INT DEFAULT 1;"))
+        if version < 3:
+            conn.execute(text("""
+                CREATE TABLE IF NOT EXISTS scans (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    started_at DATETIME NOT NULL,
+                    finished_at DATETIME NULL,
+                    model VARCHAR(255),
+                    object_count INT DEFAULT 0,
+                    status VARCHAR(20) NOT NULL DEFAULT 'running',
+                    INDEX idx_scans_status (status, id)
+                );
+            """))
+            if not self._has_column(conn, "objects", "scan_id"):
+                conn.execute(text("""
+                    ALTER TABLE objects
+                        ADD COLUMN scan_id INT NULL AFTER id,
+                        ADD COLUMN Nr INT NULL AFTER scan_id,
+                        ADD INDEX idx_objects_scan_class (scan_id, Objektart),
+                        ADD CONSTRAINT fk_objects_scan FOREIGN KEY (scan_id) REFERENCES scans(id) ON DELETE CASCADE;
+                """))
+
+
+class SQLiteBackend:
+    """
+    Dateibasiertes Speicher-Backend (SQLite im WAL-Modus) für Zellen ohne Datenbankserver.
+    Im WAL-Modus blockieren Lesezugriffe der Callbacks nicht den Schreib-Thread und umgekehrt.
+    """
+    name = "sqlite"
+    clear_query = "DELETE FROM {table};"
+
+    def __init__(self, path, pool_size, max_overflow):
+        self.path = path
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+
+    @classmethod
+    def from_config(cls, config):
+        """Erstellt das Backend aus einem Konfigurations-Dictionary (Schlüssel wie DB_CONFIG)."""
+        return cls(config["sqlite_path"], config["pool_size"], config["max_overflow"])
+
+    def __str__(self):
+        return f"SQLite ({os.path.abspath(self.path)})"
+
+    def create_engine(self):
+        """Erstellt die Engine und setzt die Verbindungsoptionen (WAL, Fremdschlüssel) für jede neue Verbindung."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        engine = create_engine(
+            f"sqlite:///{self.path}",
+            connect_args={"check_same_thread": False, "timeout": 30}, # Verbindungen wandern zwischen Threads
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_pre_ping=True
+        )
+
+        @event.listens_for(engine, "connect")
+        def set_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL;")
+            cursor.execute("PRAGMA synchronous=NORMAL;") # im WAL-Modus sicher, deutlich schnellere Commits
+            cursor.execute("PRAGMA foreign_keys=ON;")
+            cursor.close()
+
+        return engine
+
+    def drop(self):
+        """Löscht die Datenbankdatei (inkl. WAL- und Shared-Memory-Datei)."""
+        for path in (self.path, self.path + "-wal", self.path + "-shm"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def migrate(self, conn, version):
+        """Legt das Schema in der aktuellen Version an (SQLite-Datenbanken beginnen mit Version 3)."""
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS scans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at TEXT NOT NULL,
+                finished_at TEXT NULL,
+                model TEXT,
+                object_count INTEGER DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'running'
+            );
+        """))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_scans_status ON scans (status, id);"))
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS objects (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                scan_id INTEGER NULL REFERENCES scans(id) ON DELETE CASCADE,
+                Nr INTEGER NULL,
+                Image TEXT,
+                X REAL, Y REAL, Z REAL,
+                Y1 REAL, Y2 REAL, Y3 REAL, Y4 REAL, Y5 REAL,
+                Objektart TEXT,
+                Confidence REAL,
+                Bild_Pfad TEXT,
+                Beobachtungen INTEGER DEFAULT 1
+            );
+        """))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_objects_scan_class ON objects (scan_id, Objektart);"))
+
+
+# Verfügbare Speicher-Backends (Auswahl über DB_CONFIG["backend"], Erzeugung über from_config())
+STORAGE_BACKENDS = {"mysql": MySQLBackend, "sqlite": SQLiteBackend}
+
+
+class MySQLManager:
+    """
+    Verwaltung der MySQL-Datenbankverbindung und Datenoperationen für Objekterkennungsdaten.
+    Diese Klasse ermöglicht das Verbinden, Erstellen, Einfügen und Bereinigen von Datenbanken und Tabellen.
+    Als Speicher dient wahlweise ein MySQL-Server oder eine lokale SQLite-Datei (gleiche API, siehe STORAGE_BACKENDS).
+
+    Alle Zugriffe laufen über eine gemeinsame SQLAlchemy-Engine mit Verbindungspool: gleichzeitige
+    Dash-Callbacks und der Schreib-Thread erhalten jeweils eine eigene Verbindung aus dem Pool,
+    tote Verbindungen werden vor der Nutzung erkannt (pre-ping) und ersetzt.
+    """
+
+    def __init__(self, host=None, user=None, password=None, database=None, port=None,
+                 pool_size=None, max_overflow=None, backend=None, sqlite_path=None):
+        """
+        Initialisiert den MySQLManager mit Verbindungsdetails (fehlende Angaben aus DB_CONFIG).
+
+        Args:
+            host (str): Hostadresse der Datenbank. Standard ist "localhost".
+            user (str): Benutzername für die MySQL-Datenbank.
+            password (str): Passwort für die MySQL-Datenbank.
+            database (str): Name der Datenbank (Standard: "objects_db").
+            port (int): Port des MySQL-Servers (Standard: 3306).
+            pool_size (int): Anzahl dauerhaft offener Verbindungen im Pool.
+            max_overflow (int): Zusätzliche Verbindungen bei Lastspitzen.
+            backend (str): Speicher-Backend "mysql" oder "sqlite" (Standard aus DB_CONFIG).
+            sqlite_path (str): Pfad der SQLite-Datei (nur für das Backend "sqlite").
+        """
+        # übergebene Angaben überschreiben DB_CONFIG
+        overrides = {"backend": backend, "host": host, "port": port, "user": user, "password": password,
+                     "database": database, "pool_size": pool_size, "max_overflow": max_overflow,
+                     "sqlite_path": sqlite_path}
+        config = dict(DB_CONFIG, **{key: value for key, value in overrides.items() if value is not None})
+        if config["backend"] not in STORAGE_BACKENDS:
+            raise ValueError(f"Unbekanntes Datenbank-Backend: {config['backend']} (erlaubt: {', '.join(STORAGE_BACKENDS)})")
+        self.backend = STORAGE_BACKENDS[config["backend"]].from_config(config)
+        self.engine = None
+
+        self.lock = threading.Lock()
+        # Asynchrones Schreiben (write-behind): Warteschlange mit Zeilenblöcken und Schreib-Thread
+        self.write_queue = queue.Queue()
+        self.writer_thread = None
+        self.write_error = None
+
+    def connect(self):
+        """
+        Verbindet sich mit der Datenbank des gewählten Backends und erstellt bzw. aktualisiert bei Bedarf das Schema.
+        """
+        try:
+            engine = self.backend.create_engine()
+            with engine.begin() as conn:
+                self._migrate(conn)
+            self.engine = engine
+            print(f"[INFO] Datenbank {self.backend} eingerichtet (Schema-Version {SCHEMA_VERSION}).")
+        except (SQLAlchemyError, ImportError) as e: # ImportError: Datenbanktreiber nicht installiert
+            if getattr(getattr(e, "orig", None), "errno", None) == 1045:  # MySQL-Fehlercode für falsches Passwort/Nutzername
                 print(f"[Fehler] Zugriff verweigert (falsche Login-Daten). Überprüfe Benutzername/Passwort.")
             else:
-                print(f"[FEHLER] Verbindung zur MySQL-Datenbank fehlgeschlagen: {e}")
-            self.connection = None  # Verbindung als ungültig markieren
-        
+                print(f"[FEHLER] Verbindung zur Datenbank {self.backend} fehlgeschlagen: {e}")
+            self.engine = None  # Verbindung als ungültig markieren
+
+    def _migrate(self, conn):
+        """Bringt das Schema über das Backend auf SCHEMA_VERSION und vermerkt die Version."""
+        conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INT NOT NULL);"))
+        version = conn.execute(text("SELECT MAX(version) FROM schema_version;")).scalar() or 0
+        self.backend.migrate(conn, version)
+        if version < SCHEMA_VERSION:
+            conn.execute(text("DELETE FROM schema_version;"))
+            conn.execute(text("INSERT INTO schema_version (version) VALUES (:version);"), {"version": SCHEMA_VERSION})
+            print(f"[INFO] Datenbankschema von Version {version} auf {SCHEMA_VERSION} aktualisiert.")
+
     def check_connection(self):
         """
         Überprüft, ob eine aktive Verbindung zur MySQL-Datenbank besteht.
@@ -67,15 +322,21 @@ class MySQLManager:
         Returns:
             bool: True, wenn die Verbindung aktiv ist, sonst False.
         """
-        if self.connection is None:
+        if self.engine is None:
             return False
         try:
-            self.connection.ping(reconnect=False, attempts=1, delay=1)
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1;"))
             return True
-        except:
-            self.connection = None
+        except SQLAlchemyError:
             return False
 
+    def _get_engine(self):
+        """Liefert die Engine oder wirft ConnectionError, falls nicht verbunden."""
+        if self.engine is None:
+            raise ConnectionError("[FEHLER] Keine aktive Verbindung zur Datenbank.")
+        return self.engine
+
     def clear_table(self, table_name="objects"):
         """
         Löscht alle Daten in der angegebenen Tabelle.
@@ -85,16 +346,13 @@ class MySQLManager:
 
         Raises:
             ConnectionError: Falls keine aktive Verbindung zur Datenbank besteht.
-            Error: Falls das Löschen der Daten fehlschlägt.
         """
-        if not self.connection:
-            raise ConnectionError("[FEHLER] Keine aktive Verbindung zur Datenbank.")
+        engine = self._get_engine()
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(f"TRUNCATE TABLE {table_name};")
-            self.connection.commit()
+            with engine.begin() as conn:
+                conn.execute(text(self.backend.clear_query.format(table=table_name)))
             print(f"[INFO] Alle Einträge aus der Tabelle '{table_name}' wurden gelöscht.")
-        except Error as e:
+        except SQLAlchemyError as e:
             print(f"[FEHLER] Konnte die Tabelle '{table_name}' nicht bereinigen: {e}")
 
     def insert_object_data(self, object_data):
@@ -106,64 +364,173 @@ class MySQLManager:
 
         Raises:
             ConnectionError: Falls keine aktive Verbindung zur Datenbank besteht.
-            Error: Falls das Einfügen der Daten fehlschlägt.
+            SQLAlchemyError: Falls das Einfügen der Daten fehlschlägt.
+        """
+        self.insert_many([object_data])
+        print(f"[INFO] Datensatz für '{object_data['Image']}' erfolgreich gespeichert.")
+
+    def start_scan(self, model=None):
+        """
+        Legt einen neuen Scan an. Frühere Scans bleiben für spätere Auswertungen erhalten.
+
+        Args:
+            model (str, optional): Name des verwendeten YOLO-Modells.
+
+        Returns:
+            int: ID des neuen Scans.
+
+        Raises:
+            ConnectionError: Falls keine aktive Verbindung zur Datenbank besteht.
+        """
+        with self._get_engine().begin() as conn:
+            result = conn.execute(text("INSERT INTO scans (started_at, model) VALUES (:started_at, :model);"),
+                                  {"started_at": _now(), "model": model})
+            return result.lastrowid
+
+    def finish_scan(self, scan_id, object_count, status="done"):
+        """
+        Schließt einen Scan ab (Endzeit, Anzahl der Objekte und Status).
+
+        Args:
+            scan_id (int): ID des Scans.
+            object_count (int): Anzahl der gespeicherten Objekte.
+            status (str): "done" bei Erfolg, sonst z.B. "failed".
+        """
+        with self._get_engine().begin() as conn:
+            conn.execute(text("""
+                UPDATE scans SET finished_at = :finished_at, object_count = :object_count, status = :status WHERE id = :scan_id;
+            """), {"scan_id": scan_id, "object_count": object_count, "status": status, "finished_at": _now()})
+
+    def latest_scan_id(self):
+        """
+        Liefert die ID des zuletzt abgeschlossenen Scans (über den Index auf status, id).
+
+        Returns:
+            int | None: Scan-ID oder None, falls noch kein Scan abgeschlossen wurde.
+        """
+        with self._get_engine().connect() as conn:
+            return conn.execute(text("SELECT MAX(id) FROM scans WHERE status = 'done';")).scalar()
+
+    def insert_many(self, objects, scan_id=None):
+        """
+        Fügt mehrere Datensätze mit executemany in einer einzigen Transaktion ein.
+        Schlägt ein Datensatz fehl, wird der gesamte Block zurückgerollt.
+
+        Args:
+            objects (list): Liste von Dictionaries mit den einzufügenden Daten.
+            scan_id (int, optional): Scan, dem alle Datensätze zugeordnet werden.
+
+        Raises:
+            ConnectionError: Falls keine aktive Verbindung zur Datenbank besteht.
+            SQLAlchemyError: Falls das Einfügen der Daten fehlschlägt.
         """
-        if not self.connection:
-            raise ConnectionError("Keine aktive Verbindung zur MySQL-Datenbank.")
+        if not objects:
+            return
+        engine = self._get_engine()
         try:
-            cursor = self.connection.cursor()
-            insert_query = """
-                INSERT INTO objects (Image, X, Y, Z, Y1, Y2, Y3, Y4, Y5, Objektart, Confidence, Bild_Pfad)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(insert_query, (
-                object_data["Image"],
-                object_data["X"], object_data["Y"], object_data["Z"],
-                object_data["Y1"], object_data["Y2"], object_data["Y3"], object_data["Y4"], object_data["Y5"],
-                object_data["Objektart"], object_data["Confidence"],
-                object_data["Bild_Pfad"]
-            ))
-            self.connection.commit()
-            print(f"[INFO] Datensatz für '{object_data['Image']}' erfolgreich gespeichert.")
-        except Error as e:
+            with engine.begin() as conn:
+                conn.execute(INSERT_OBJECT_QUERY, [_object_row(object_data, scan_id) for object_data in objects])
+        except SQLAlchemyError as e:
             print(f"[FEHLER] Einfügen der Daten in die Tabelle fehlgeschlagen: {e}")
             raise e
 
-    def close_connection(self):
+    def insert_many_async(self, objects, scan_id=None):
         """
-        Schließt die Verbindung zur MySQL-Datenbank.
+        Übergibt mehrere Datensätze an den Schreib-Thread (write-behind) und kehrt sofort zurück.
+        Mit flush() wird auf das Ende aller ausstehenden Schreibvorgänge gewartet.
+
+        Args:
+            objects (list): Liste von Dictionaries mit den einzufügenden Daten.
+            scan_id (int, optional): Scan, dem alle Datensätze zugeordnet werden.
         """
-        if self.connection:
-            self.connection.close()
-            self.connection = None
-            print("[INFO] Verbindung zur MySQL-Datenbank erfolgreich geschlossen.")
-        else:
-            print("[WARNUNG] Keine aktive Verbindung zum Schließen vorhanden.")
+        if not objects:
+            return
+        self.write_queue.put((list(objects), scan_id))
+        with self.lock:
+            if self.writer_thread is None or not self.writer_thread.is_alive():
+                self.writer_thread = threading.Thread(target=self._write_behind, name="mysql-writer", daemon=True)
+                self.writer_thread.start()
+
+    def _write_behind(self):
+        """Schreib-Thread: arbeitet die Warteschlange blockweise ab."""
+        while True:
+            objects, scan_id = self.write_queue.get()
+            try:
+                self.insert_many(objects, scan_id)
+            except Exception as e:
+                self.write_error = e
+            finally:
+                self.write_queue.task_done()
 
-    def remove_duplicates_and_reset_ids(self, duplicate_ids):
+    def flush(self):
         """
-        Entfernt doppelte Einträge aus der Tabelle und setzt die ID-Zählung zurück.
+        Wartet, bis alle mit insert_many_async() übergebenen Datensätze geschrieben wurden.
+
+        Raises:
+            Exception: Der erste Fehler eines asynchronen Schreibvorgangs seit dem letzten flush().
+        """
+        self.write_queue.join()
+        error, self.write_error = self.write_error, None
+        if error is not None:
+            raise error
+
+    def update_object_position(self, scan_id, nr, x, y):
+        """
+        Speichert die neue Position eines Objekts (z.B. nach Pick & Place).
 
         Args:
-            duplicate_ids (list): Liste mit den IDs der zu löschenden Duplikate.
+            scan_id (int): ID des Scans.
+            nr (int): Objektnummer innerhalb des Scans.
+            x (float): Neue X-Koordinate.
+            y (float): Neue Y-Koordinate.
+
+        Returns:
+            bool: True, falls das Objekt gefunden wurde.
 
         Raises:
-            Error: Falls das Entfernen der Duplikate fehlschlägt.
+            ConnectionError: Falls keine aktive Verbindung zur Datenbank besteht.
         """
-        try:
-            cursor = self.connection.cursor()
-            # Löscht alle Einträge mit den übergebenen IDs
-            ids_str = ", ".join(map(str, duplicate_ids))
-            cursor.execute(f"DELETE FROM objects WHERE id IN ({ids_str});")
-            self.connection.commit()
-
-            # IDs neu sortieren
-            cursor.execute("SET @count = 0;")
-            cursor.execute("UPDATE objects SET id = (@count:=@count+1) ORDER BY id;")
-            cursor.execute("ALTER TABLE objects AUTO_INCREMENT = 1;")
-            self.connection.commit()
-            print("[INFO] Doppelte Einträge entfernt und IDs zurückgesetzt.")
-        except Error as e:
-            print(f"[FEHLER] Konnte die Duplikate nicht entfernen oder IDs nicht zurücksetzen: {e}")
-            raise e
-        
\ No newline at end of file
+        with self._get_engine().begin() as conn:
+            result = conn.execute(text("UPDATE objects SET X = :x, Y = :y WHERE scan_id = :scan_id AND Nr = :nr;"),
+                                  {"scan_id": scan_id, "nr": int(nr), "x": round(float(x), 5), "y": round(float(y), 5)})
+            return result.rowcount > 0
+
+    def read_objects(self, scan_id=None):
+        """
+        Liest die Objekte eines Scans über den Index (scan_id, Objektart).
+
+        Args:
+            scan_id (int, optional): ID des Scans (Standard: zuletzt abgeschlossener Scan).
+
+        Returns:
+            pd.DataFrame: Objekte des Scans; die Spalte "id" enthält die Objektnummer innerhalb des Scans.
+
+        Raises:
+            ConnectionError: Falls keine aktive Verbindung zur Datenbank besteht.
+        """
+        if scan_id is None:
+            scan_id = self.latest_scan_id()
+            if scan_id is None:
+                return pd.DataFrame(columns=["id"] + DATA_COLUMNS)
+        with self._get_engine().connect() as conn:
+            return pd.read_sql(SELECT_SCAN_QUERY, con=conn, params={"scan_id": scan_id})
+
+    def drop_database(self):
+        """
+        Schließt den Pool und löscht die Datenbank des Backends vollständig (z.B. nach einem Benchmark).
+        """
+        if self.engine is not None:
+            self.close_connection()
+        self.backend.drop()
+        print(f"[INFO] Datenbank {self.backend} gelöscht.")
+
+    def close_connection(self):
+        """
+        Schließt alle Verbindungen des Pools.
+        """
+        if self.engine is not None:
+            self.engine.dispose()
+            self.engine = None
+            print(f"[INFO] Verbindung zur Datenbank {self.backend} erfolgreich geschlossen.")
+        else:
+            print("[WARNUNG] Keine aktive Verbindung zum Schließen vorhanden.")
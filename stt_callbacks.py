@@ -81,8 +81,11 @@ def process_stt_command(command, qarm):
 
     # Home-Position anfahren
     if "startposition" in cmd_lower or "start position" in cmd_lower or "home" in cmd_lower:
-        result["feedback"] = "Die Start-Position wurde angefahren."
-        qarm.go_to("home")
+        if qarm.is_busy():
+            result["feedback"] = "Der Roboter ist gerade beschäftigt. Bitte warten Sie, bis der Vorgang abgeschlossen ist."
+        else:
+            result["feedback"] = "Ich fahre die Start-Position an."
+            qarm.go_to_async("home")
 
     # LED-Steuerung
     elif "rgb" in cmd_lower and "rot" in cmd_lower:
@@ -1,6 +1,13 @@
 import dash_bootstrap_components as dbc
 from dash import html, dcc, Output, Input
 
+# Stream-Profile für langsame Verbindungen (werden serverseitig auf erlaubte Stufen gerundet)
+FEED_PROFILES = {
+    "hoch": "width=1280&quality=80&fps=30",
+    "mittel": "width=960&quality=70&fps=15",
+    "niedrig": "width=640&quality=50&fps=10",
+}
+
 class LiveFeed:
     """
     Diese Klasse verwaltet den "Live-Feed"-Tab der Dash-Anwendung.
@@ -8,6 +15,8 @@ class LiveFeed:
     Funktionen:
     - Zeigt den Live-Kamerastream des Quanser 4-DOF Roboters an (RGB oder Tiefenbild).
     - Ermöglicht das Umschalten zwischen RGB- und Tiefenbildmodus.
+    - Blendet optional die Live-Detektionen des aktuellen YOLO-Modells in das Farbbild ein.
+    - Erlaubt die Wahl der Stream-Qualität (Auflösung, JPEG-Qualität, Bildrate) für langsame Verbindungen.
     - Überprüft regelmäßig die Kameraverbindung und aktualisiert den Statusindikator.
     - Bietet die Möglichkeit, den Live-Feed in einem separaten Fenster zu öffnen.
     """
@@ -52,6 +61,23 @@ class LiveFeed:
                     value=False,
                     className="mb-3"
                 ),
+                dbc.Switch(
+                    id="detection-switch",
+                    label="YOLO-Detektionen einblenden",
+                    value=False,
+                    className="mb-3"
+                ),
+                dbc.RadioItems(
+                    id="feed-quality",
+                    options=[
+                        {"label": "Hohe Qualität", "value": "hoch"},
+                        {"label": "Mittel", "value": "mittel"},
+                        {"label": "Niedrig (langsame Verbindung)", "value": "niedrig"}
+                    ],
+                    value="hoch",
+                    inline=True,
+                    className="mb-3"
+                ),
                 html.Div(id="feed-container"),
 
                 # Buttons für externe Fenster
@@ -74,14 +100,18 @@ class LiveFeed:
         @self.app.callback(
             Output("feed-container", "children"),
             [Input("feed-switch", "value"),
+             Input("detection-switch", "value"),
+             Input("feed-quality", "value"),
              Input("interval-check", "n_intervals")]
         )
-        def update_feed_display(is_depth_on, n_intervals):
+        def update_feed_display(is_depth_on, is_detection_on, quality, n_intervals):
             """
-            Aktualisiert den Live-Feed-Bereich basierend auf dem gewählten Bildmodus (RGB/Tiefenbild).
+            Aktualisiert den Live-Feed-Bereich basierend auf dem gewählten Bildmodus (RGB/Tiefenbild) und Stream-Profil.
             
             Args:
                 is_depth_on (bool): Gibt an, ob der Tiefenbildmodus aktiviert ist.
+                is_detection_on (bool): Gibt an, ob die Live-Detektionen im Farbbild angezeigt werden.
+                quality (str): Gewähltes Stream-Profil (siehe FEED_PROFILES).
                 n_intervals (int): Intervall-Trigger zur regelmäßigen Aktualisierung.
 
             Returns:
@@ -89,10 +119,13 @@ class LiveFeed:
             """
             if not self.camera.check_connection():
                 return html.H5("- Kein Signal -", style={"color": "orange"})
+            query = FEED_PROFILES.get(quality, FEED_PROFILES["hoch"])
             if is_depth_on:
-                return html.Img(src="/video_feed_depth", style={"width": "100%"})
+                return html.Img(src=f"/video_feed_depth?{query}", style={"width": "100%"})
+            elif is_detection_on:
+                return html.Img(src=f"/video_feed_detections?{query}", style={"width": "100%"})
             else:
-                return html.Img(src="/video_feed_rgb", style={"width": "100%"})
+                return html.Img(src=f"/video_feed_rgb?{query}", style={"width": "100%"})
 
         # Live-Indikator
         @self.app.callback(
@@ -231,13 +231,22 @@ class ManualControl:
                     return "Roboter nicht verbunden."
                 if z is None or z < 0.15:
                     return "⚠️ Achtung Tisch! Die z-Koordinate muss mindestens 0.15 sein."
+                if self.qarm.is_busy():
+                    return "Roboter ist beschäftigt (Scan oder Pick & Place läuft)."
                 coord = np.array([x, y, z])
+                rotation = rot if rot is not None else 0
                 try:
-                    self.qarm.go_to(coord, rotation=rot if rot is not None else 0)
-                    self.qarm.LED_Control(np.array(led_cmd, dtype=np.float64))
-                    return f"Fahre zu: X={x}, Y={y}, Z={z} (Rotation: {rot if rot is not None else 0}°)."
+                    # Grenzen und Inverse Kinematik sofort prüfen, erst dann die Fahrt einreihen
+                    self.qarm.validate_target(coord, rotation)
                 except Exception as e:
                     return f"Fehler bei Koordinatenfahrt: {str(e)}"
+
+                def move():
+                    # LED erst nach erfolgreicher Fahrt setzen
+                    self.qarm.go_to(coord, rotation=rotation)
+                    self.qarm.LED_Control(np.array(led_cmd, dtype=np.float64))
+                self.qarm.submit(move)
+                return f"Fahrt gestartet zu: X={x}, Y={y}, Z={z} (Rotation: {rotation}°)."
             return ""
 
         # Manuelle Gelenksteuerung
@@ -259,11 +268,11 @@ class ManualControl:
             if self.qarm is None:
                 return "Roboter nicht verbunden."
             button_id = ctx.triggered[0]["prop_id"].split(".")[0]
-            try:
-                self.qarm.my_arm.read_std()  # Aktualisiere die aktuellen Gelenkpositionen
-                scan_pos_joints = np.copy(self.qarm.my_arm.measJointPosition[:4])
-                step_size = step_size if step_size else 5
+            step_size = step_size if step_size else 5
+            if self.qarm.is_busy():
+                return "Roboter ist beschäftigt (Scan oder Pick & Place läuft)."
 
+            def apply_step(scan_pos_joints):
                 if button_id == "btn-base-plus":
                     scan_pos_joints[0] += np.radians(step_size)
                 elif button_id == "btn-base-minus":
@@ -276,10 +285,21 @@ class ManualControl:
                     scan_pos_joints[2] += np.radians(step_size)
                 elif button_id == "btn-elbow-minus":
                     scan_pos_joints[2] -= np.radians(step_size)
+                return scan_pos_joints
 
+            def jog():
+                # läuft im Motion-Executor: Ausgangsstellung erst bei Ausführung lesen,
+                # damit mehrere schnelle Klicks aufeinander aufbauen
+                scan_pos_joints = apply_step(self.qarm.read_joint_positions()[:4])
                 self.qarm.go_to_joint(scan_pos_joints)
                 self.qarm.LED_Control((np.array(led_cmd, dtype=np.float64)))
-                return f"Gelenkbewegung ausgeführt: {np.degrees(scan_pos_joints)}"
+
+            try:
+                # Grenzen sofort prüfen (ausgehend von der aktuellen Stellung); bei Ausführung wird erneut geprüft
+                self.qarm.validate_joint_target(apply_step(self.qarm.read_joint_positions()[:4]))
+                self.qarm.submit(jog)
+                pending = self.qarm.pending_commands()
+                return f"Gelenkbewegung eingereiht ({step_size}°, wartende Befehle: {pending})."
             except Exception as e:
                 return f"Fehler bei manueller Gelenksteuerung: {str(e)}"
 
@@ -1,8 +1,14 @@
-import os, base64
-import pandas as pd
 import dash_bootstrap_components as dbc
 from dash import dcc, html, callback_context, Output, Input, State, dash_table, no_update
 from scan_manager import ScanManager, create_birdseye_map
+from scan_cache import ScanCache
+from scan_images import ScanImageStore
+from robot_jobs import RobotJobRunner
+from yolo_model import model_registry
+
+# Schritte einer Pick-&-Place-Folge, zwischen denen der Greifer das Objekt hält (siehe Scan._place_job)
+GRAB_STEP = "Greifen"
+RELEASE_STEP = "Ablegen"
 
 class Scan:
     """
@@ -29,9 +35,102 @@ class Scan:
         self.qarm = qarm
         self.camera = camera
         self.mysql_manager = mysql_manager
+        # Scan-Tabellen bleiben auf dem Server, "scan-df-store" enthält nur {"scan_id", "version"}
+        self.scan_cache = ScanCache(loader=mysql_manager.read_objects, writer=mysql_manager.update_object_position)
+        # Scanbilder werden über eine Flask-Route als Vorschaubilder ausgeliefert (siehe dash_app.py)
+        self.image_store = ScanImageStore(folder="Scans/makro", route="/scan_images")
+        # Scan und Pick & Place laufen als Hintergrundaufgabe, die Oberfläche fragt den Fortschritt ab
+        self.job_runner = RobotJobRunner()
         self.layout = self.render_layout()
         self.register_callbacks()
 
+    def _scan_job(self, job, yolo_model_path, yolo_backend):
+        """
+        Hintergrundaufgabe: vollständiger Scan.
+
+        Args:
+            job (RobotJob): Aufgabe für Fortschritt und Abbruch.
+            yolo_model_path (str): Pfad zum YOLO-Modell.
+            yolo_backend (str): Inferenz-Backend des Modells.
+
+        Returns:
+            dict | None: Referenz auf das Scan-Ergebnis im ScanCache oder None, falls keine Objekte erkannt wurden.
+        """
+        # Latenzmessungen der Registry pausieren, solange der Scan läuft (gemeinsame CPU und Inferenzsperre)
+        with model_registry.scan_active():
+            scan_manager = ScanManager(
+                yolo_model_path=yolo_model_path,
+                qarm=self.qarm,
+                camera=self.camera,
+                mysql_manager=self.mysql_manager,
+                yolo_backend=yolo_backend
+            )
+            # ganzer Scan als ein Ablauf im Motion-Executor --> keine fremden Befehle zwischen Drehung und Aufnahme
+            df = self.qarm.run_sequence(scan_manager.run_scan, job=job)
+        if df.empty or scan_manager.scan_id is None:
+            return None
+        return self.scan_cache.put(scan_manager.scan_id, df)
+
+    def _place_job(self, job, moves, scan_ref, object_id, source_coord, target_coord, status_msg):
+        """
+        Hintergrundaufgabe: Pick & Place als Folge einzelner Bewegungen.
+        Vor jeder Bewegung wird ein Abbruch geprüft. Hält der Greifer das Objekt bereits (nach GRAB_STEP, vor
+        RELEASE_STEP), wird es bei Abbruch oder Fehler zuerst an seiner Ausgangsposition abgelegt; danach fährt
+        der Roboter in die Home-Position.
+
+        Args:
+            job (RobotJob): Aufgabe für Fortschritt und Abbruch.
+            moves (list): Tupel (Bezeichnung, Funktion) in Ausführungsreihenfolge.
+            scan_ref (dict): Referenz auf den Scan im ScanCache.
+            object_id (str): Nummer des bewegten Objekts.
+            source_coord (list): Greifposition [X, Y, Z] (Ablage bei Abbruch).
+            target_coord (list): Ablageposition [X, Y, Z].
+            status_msg (str): Meldung nach erfolgreicher Platzierung.
+
+        Returns:
+            tuple: Neue Scan-Referenz (mit aktualisierter Objektposition) und Statusmeldung.
+        """
+        # ganze Folge als ein Ablauf im Motion-Executor --> keine fremden Befehle, während das Objekt gehalten wird
+        return self.qarm.run_sequence(self._place_sequence, job, moves, scan_ref, object_id,
+                                      source_coord, target_coord, status_msg)
+
+    def _place_sequence(self, job, moves, scan_ref, object_id, source_coord, target_coord, status_msg):
+        """Ablauf von _place_job (läuft im Motion-Executor)."""
+        holding = False
+        try:
+            for step, (label, move) in enumerate(moves, start=1):
+                job.raise_if_cancelled()
+                job.report(step=step, steps=len(moves), label=label)
+                move()
+                if label == GRAB_STEP:
+                    holding = True
+                elif label == RELEASE_STEP:
+                    holding = False
+                    # Objekt liegt am Ziel --> Position sofort speichern (auch falls die Heimfahrt fehlschlägt)
+                    scan_ref = self.scan_cache.update_position(scan_ref, object_id, target_coord[0], target_coord[1])
+        except BaseException:
+            if holding:
+                self._put_back(job, source_coord)
+            job.report(label="Home-Position")
+            try:
+                self.qarm.go_to("home")
+            except Exception as e:
+                print(f"[FEHLER] Roboter konnte nicht in die Home-Position fahren: {e}")
+            raise
+        return scan_ref, status_msg
+
+    def _put_back(self, job, source_coord):
+        """Legt ein gegriffenes Objekt nach Abbruch oder Fehler an seiner Ausgangsposition ab."""
+        job.report(label="Objekt zurücklegen")
+        try:
+            self.qarm.go_to(source_coord)
+        except Exception as e:
+            print(f"[FEHLER] Ausgangsposition nicht erreichbar, Objekt wird an der aktuellen Position abgelegt: {e}")
+        try:
+            self.qarm.gripper(cmd=0)
+        except Exception as e:
+            print(f"[FEHLER] Greifer konnte nicht geöffnet werden: {e}")
+
     def render_layout(self):
         """
         Erstellt das Layout für den "Scan"-Tab.
@@ -60,12 +159,13 @@ class Scan:
                 ], width=6),
                 dbc.Col([
                     dbc.Button("SCAN", id="btn-scan", color="success", disabled=True, style={"width": "150px", "height":"120px"}),
-                    dcc.Loading(
-                        id="loading-scan-status",
-                        type="default",
-                        children=[html.Div(id="scan-action-status")],
-                        style={"marginTop": "50px"}
-                    )
+                    html.Div(id="scan-action-status", style={"marginTop": "20px"}),
+                    # Fortschritt der laufenden Hintergrundaufgabe (Scan oder Pick & Place)
+                    dbc.Progress(id="scan-job-progress", value=0, striped=True, animated=True,
+                                 style={"width": "100%", "marginTop": "10px", "display": "none"}),
+                    html.Div(id="scan-job-progress-text", style={"marginTop": "5px"}),
+                    dbc.Button("Abbrechen", id="btn-cancel-job", color="danger", size="sm", disabled=True, style={"marginTop": "10px"}),
+                    dcc.Interval(id="scan-job-interval", interval=500, n_intervals=0, disabled=True)
                 ], width=6,  className="d-flex flex-column justify-content-center align-items-center", style={"paddingLeft": "30px"})
             ], className="mb-3"),
 
@@ -220,13 +320,13 @@ class Scan:
             [Input("scan-df-store", "data"),
              Input("tabs", "active_tab")]
         )
-        def update_birdseye_map(scan_data, active_tab):
+        def update_birdseye_map(scan_ref, active_tab):
             if active_tab != "scan":
                 return no_update
-            if not scan_data:
+            result = self.scan_cache.get(scan_ref)
+            if result is None:
                 return create_birdseye_map(df=None)  # sonst nur Arbeitsbereich einzeichnen
-            df = pd.DataFrame(scan_data)
-            fig = create_birdseye_map(df[["id", "X", "Y", "Objektart"]])
+            fig = create_birdseye_map(result.df[["id", "X", "Y", "Objektart"]])
             return fig
         
         # CALLBACK 5: DataTable mit Scanergebnissen
@@ -235,13 +335,13 @@ class Scan:
             [Input("scan-df-store", "data"),
              Input("tabs", "active_tab")]
         )
-        def update_datatable(scan_data, active_tab):
+        def update_datatable(scan_ref, active_tab):
             if active_tab != "scan":
                 return no_update
-            if not scan_data:
+            result = self.scan_cache.get(scan_ref)
+            if result is None:
                 return "Keine Scan-Daten oder Objekte im Arbeitsbereich vorhanden."
-            df = pd.DataFrame(scan_data)
-            return generate_table(df)
+            return generate_table(result.df)
 
         # CALLBACK 6: Dropdowns der Pick&Place befüllen
         @self.app.callback(
@@ -251,14 +351,14 @@ class Scan:
             [Input("scan-df-store", "data"),
              Input("tabs", "active_tab")]
         )
-        def update_placement_options(scan_data, active_tab):
+        def update_placement_options(scan_ref, active_tab):
             if active_tab != "scan":
                 return no_update
-            if not scan_data:
+            result = self.scan_cache.get(scan_ref)
+            if result is None:
                 return [[], [], []]
-            df = pd.DataFrame(scan_data)
-            options = [{"label": f"{row['id']} - {row['Objektart']}", "value": str(row["id"])} 
-                    for index, row in df.iterrows()]
+            options = [{"label": f"{object_id} - {class_name}", "value": object_id}
+                       for object_id, class_name in zip(result.ids, result.column("Objektart"))]
             return options, options, options
 
         # CALLBACK 7: Scan-Bilder im 9x9 Raster
@@ -267,34 +367,25 @@ class Scan:
             Input("refresh-scan-images", "n_clicks")
         )
         def update_scan_images(n):
-            scan_folder = "Scans/makro"
-            
-            # Finde alle Bilddateien (.png)
-            files = sorted([f for f in os.listdir(scan_folder) if f.lower().endswith(('.png'))])
-            
+            # Nur URLs senden: der Browser lädt die Vorschaubilder einzeln über /scan_images (und hält sie im Cache)
+            images = self.image_store.list_images()
             items = []
-            total = len(files)
-            for i, filename in enumerate(files):
-                file_path = os.path.join(scan_folder, filename)
-                try:
-                    with open(file_path, "rb") as f:
-                        encoded = base64.b64encode(f.read()).decode('ascii')
-                    src = f"data:image/png;base64,{encoded}"
-                    # Erstelle ein Carousel-Item
-                    caption = f"Scan-Bild {i+1}/{total}"
-                    items.append({
-                        "key": filename,
-                        "src": src,
-                        "header": "",      # Keine Überschrift
-                        "caption": caption,     # Beschreibung Bild {x/total}
-                        "img_style": {
-                            "width": "100%",
-                            "height": "auto",
-                            "objectFit": "cover"
-                        }
-                    })
-                except Exception as e:
-                    continue
+            total = len(images)
+            for i, (filename, mtime_ns) in enumerate(images):
+                caption = f"Scan-Bild {i+1}/{total}"
+                items.append({
+                    "key": filename,
+                    "src": self.image_store.thumbnail_url(filename, mtime_ns),
+                    "href": self.image_store.image_url(filename, mtime_ns), # Klick öffnet das Originalbild
+                    "external_link": True,
+                    "header": "",      # Keine Überschrift
+                    "caption": caption,     # Beschreibung Bild {x/total}
+                    "img_style": {
+                        "width": "100%",
+                        "height": "auto",
+                        "objectFit": "cover"
+                    }
+                })
 
             if not items:
                 return "Keine Scan-Bilder gefunden."
@@ -313,9 +404,8 @@ class Scan:
         # --------------------------------- SCAN + PICK & PLACE -----------------------------------
         @self.app.callback(
             [
-            Output("scan-df-store", "data"),
-            Output("placement-status", "children"),
-            Output("scan-action-status", "children")
+            Output("scan-job-store", "data"),
+            Output("scan-job-interval", "disabled", allow_duplicate=True)
             ],
             [
             Input("btn-scan", "n_clicks"),
@@ -324,6 +414,7 @@ class Scan:
             ],
             [
             State("yolo-dropdown", "value"),
+            State("yolo-backend-dropdown", "value"),
             State("scan-df-store", "data"),
             # Werte aus Sprachbefehl
             State("global-placement-dropdown-1", "value"),
@@ -337,25 +428,28 @@ class Scan:
             State("placement-dropdown-single", "value"),
             State("placement-x", "value"),
             State("placement-y", "value")
-            ]
+            ],
+            prevent_initial_call=True
         )
         def combined_callback(n_scan, n_place_obj, n_place_coord,
-                            selected_yolo_model, scan_data,
+                            selected_yolo_model, selected_yolo_backend, scan_ref,
                             global_dropdown1, global_dropdown2, global_dropdown_single, global_x, global_y,
                             placement_dropdown1, placement_dropdown2, placement_dropdown_single, 
                             placement_x, placement_y):
             """
-            Haupt-Callback zur Steuerung des Scan- und Pick-&-Place-Prozesses.
+            Haupt-Callback zum Starten des Scan- und Pick-&-Place-Prozesses.
 
-            - Führt den Scan durch, wenn der Scan-Button gedrückt wird.
-            - Führt Pick-&-Place-Operationen aus (Objekt zu Objekt oder Objekt zu Koordinaten).
+            - Prüft die Eingaben und startet den Scan bzw. die Pick-&-Place-Operation (Objekt zu Objekt oder
+              Objekt zu Koordinaten) als Hintergrundaufgabe im RobotJobRunner.
+            - Der Callback kehrt sofort zurück; Fortschritt und Ergebnis liefert poll_job().
 
             Args:
                 n_scan (int): Anzahl der Klicks auf den Scan-Button.
                 n_place_obj (int): Anzahl der Klicks auf den "Platzieren zu Objekt"-Button.
                 n_place_coord (int): Anzahl der Klicks auf den "Platzieren zu Koordinaten"-Button.
                 selected_yolo_model (str): Aktuell gewähltes YOLO-Modell.
-                scan_data (list): Liste der gescannten Objekte.
+                selected_yolo_backend (str): Gewähltes Inferenz-Backend des Modells.
+                scan_ref (dict): Referenz {"scan_id", "version"} auf den Scan im serverseitigen ScanCache.
                 global_dropdown1, global_dropdown2, global_dropdown_single (str): Sprachsteuerungs-IDs für die Objektauswahl.
                 global_x, global_y (float): Sprachsteuerungs-Koordinaten.
                 placement_dropdown1, placement_dropdown2, placement_dropdown_single (str): Manuell gewählte Objektauswahl.
@@ -363,38 +457,32 @@ class Scan:
 
             Returns:
                 Tuple:
-                    - Aktualisierte Scan-Daten.
-                    - Statusmeldung für Pick-&-Place.
-                    - Statusmeldung für den Scan-Vorgang.
+                    - Job-Info {"job_id", "kind", "message"} (job_id None, falls nur eine Meldung angezeigt wird).
+                    - Zustand des Abfrage-Intervalls (False = Fortschritt abfragen).
             """
             
             ctx = callback_context
             if not ctx.triggered:
-                return no_update, no_update, no_update
+                return no_update, no_update
             triggered_id = ctx.triggered[0]["prop_id"].split(".")[0]
 
+            def message(text):
+                return {"job_id": None, "kind": "place", "message": text}, True
+
             # Prüfung Roboterverbindung
             if not (self.qarm and self.qarm.my_arm):
-                    return no_update, "Fehler: Roboter nicht korrekt verbunden.", no_update
+                    return message("Fehler: Roboter nicht korrekt verbunden.")
             
             # ==================== SCAN ====================
             if triggered_id == "btn-scan" and (n_scan is None or n_scan <= 0):
-                return no_update, no_update, no_update
+                return no_update, no_update
             if triggered_id == "btn-scan":
                 if not selected_yolo_model:
-                    return None, "Kein YOLO Modell ausgewählt. Bitte Modell nutzen.", no_update
-                
-                scan_manager = ScanManager(
-                    yolo_model_path=selected_yolo_model,
-                    qarm=self.qarm,
-                    camera=self.camera,
-                    mysql_manager=self.mysql_manager
-                )
-                df = scan_manager.run_scan()
-                if df.empty:
-                    return None, "Keine Objekte erkannt.", no_update
-                new_data = df.to_dict('records')
-                return new_data, "", "Scan abgeschlossen!"
+                    return message("Kein YOLO Modell ausgewählt. Bitte Modell nutzen.")
+                job = self.job_runner.start("scan", self._scan_job, selected_yolo_model, selected_yolo_backend or "pytorch")
+                if job is None:
+                    return message("Es läuft bereits eine Aufgabe des Roboters.")
+                return {"job_id": job.id, "kind": "scan", "message": None}, False
 
 
             # ==================== PICK&PLACE FUNKTIONEN ====================
@@ -412,86 +500,156 @@ class Scan:
             effective_y = global_y if (global_y is not None and global_y != default_coord) else placement_y
 
 
+
             # ==================== VAR 1 - Objekt zu Objekt ====================
             if triggered_id == "btn-place-objects-compare":
-                if not scan_data:
-                    return no_update, "Keine Scan-Daten vorhanden.", no_update
+                scan_result = self.scan_cache.get(scan_ref)
+                if scan_result is None:
+                    return message("Keine Scan-Daten vorhanden.")
                 if effective_dropdown1 is None or effective_dropdown2 is None:
-                    return scan_data, "Bitte wählen Sie beide Objekte aus.", no_update
+                    return message("Bitte wählen Sie beide Objekte aus.")
                 # prüfen ob ids überhaupt möglich in df
-                found_obj1 = any(str(row["id"]) == str(effective_dropdown1) for row in scan_data)
-                found_obj2 = any(str(row["id"]) == str(effective_dropdown2) for row in scan_data)
-                if not (found_obj1 and found_obj2):
-                    return scan_data, "Die angegebenen Objekt-IDs liegen außerhalb des verfügbaren Bereichs.", no_update
-                self.qarm.gripper(cmd=0)
-                coord_a = None
-                for row in scan_data:
-                    if str(row["id"]) == str(effective_dropdown1):
-                        coord_a = [row["X"], row["Y"], 0.05]
-                        coord_a1 = [row["X"], row["Y"], 0.15]
-                        break
-                if coord_a is None:
-                    return scan_data, f"Objekt {effective_dropdown1} nicht gefunden.", no_update
-                self.qarm.go_to(coord_a)
-                self.qarm.gripper(cmd=1) 
-                self.qarm.go_to(coord_a1)
-                coord_b = None
-                for row in scan_data:
-                    if str(row["id"]) == str(effective_dropdown2):
-                        coord_b0 = [row["X"], row["Y"], 0.15]
-                        coord_b = [row["X"], row["Y"], 0.075]
-                        break
-                if coord_b is None:
-                    return scan_data, f"Objekt {effective_dropdown2} nicht gefunden.", no_update
-                self.qarm.go_to(coord_b)
-                self.qarm.gripper(cmd=0)
-                self.qarm.go_to("home")
-                for row in scan_data:
-                    if str(row["id"]) == str(effective_dropdown1):
-                        row["X"] = coord_b[0]
-                        row["Y"] = coord_b[1]
-                        break
+                position_a = scan_result.position(effective_dropdown1)
+                position_b = scan_result.position(effective_dropdown2)
+                if position_a is None or position_b is None:
+                    return message("Die angegebenen Objekt-IDs liegen außerhalb des verfügbaren Bereichs.")
+                coord_a = [position_a[0], position_a[1], 0.05]
+                coord_a1 = [position_a[0], position_a[1], 0.15]
+                coord_b = [position_b[0], position_b[1], 0.075]
+                moves = [
+                    ("Greifer öffnen", lambda: self.qarm.gripper(cmd=0)),
+                    (f"Zu Objekt {effective_dropdown1}", lambda: self.qarm.go_to(coord_a)),
+                    (GRAB_STEP, lambda: self.qarm.gripper(cmd=1)),
+                    ("Anheben", lambda: self.qarm.go_to(coord_a1)),
+                    (f"Zu Objekt {effective_dropdown2}", lambda: self.qarm.go_to(coord_b)),
+                    (RELEASE_STEP, lambda: self.qarm.gripper(cmd=0)),
+                    ("Home-Position", lambda: self.qarm.go_to("home"))
+                ]
                 status_msg = f"Platzierung von Objekt {effective_dropdown1} zu Objekt {effective_dropdown2} durchgeführt."
-                return scan_data, status_msg, no_update
+                job = self.job_runner.start("place", self._place_job, moves, scan_ref, effective_dropdown1, coord_a, coord_b, status_msg)
 
 
             # ==================== VAR 2 - Objekt zu Koord ====================
             elif triggered_id == "btn-place-object-coord":
-                if not scan_data:
-                    return no_update, "Keine Scan-Daten vorhanden.", no_update
+                scan_result = self.scan_cache.get(scan_ref)
+                if scan_result is None:
+                    return message("Keine Scan-Daten vorhanden.")
                 if effective_dropdown_single is None or (effective_x is None or effective_y is None):
-                    return scan_data, "Bitte wählen Sie ein Objekt und geben Sie gültige Koordinaten ein.", no_update
+                    return message("Bitte wählen Sie ein Objekt und geben Sie gültige Koordinaten ein.")
                 # prüfen ob id in df erreichbar
-                found_obj = any(str(row["id"]) == str(effective_dropdown_single) for row in scan_data)
-                if not found_obj:
-                    return scan_data, f"Objekt {effective_dropdown_single} nicht gefunden.", no_update
-                self.qarm.gripper(cmd=0)
-                coord_a = None
-                for row in scan_data:
-                    if str(row["id"]) == str(effective_dropdown_single):
-                        coord_a = [row["X"], row["Y"], 0.05]
-                        coord_a1 = [row["X"], row["Y"], 0.15]
-                        break
-                if coord_a is None:
-                    return scan_data, f"Objekt {effective_dropdown_single} nicht gefunden.", no_update
-                self.qarm.go_to(coord_a)
-                self.qarm.gripper(cmd=1)
+                position_a = scan_result.position(effective_dropdown_single)
+                if position_a is None:
+                    return message(f"Objekt {effective_dropdown_single} nicht gefunden.")
+                coord_a = [position_a[0], position_a[1], 0.05]
                 target_coord_0 = [effective_x, effective_y, 0.15]
-                self.qarm.go_to(target_coord_0)
                 target_coord = [effective_x, effective_y, 0.05]
-                self.qarm.go_to(target_coord)
-                self.qarm.gripper(cmd=0)
-                self.qarm.go_to("home")
-                for row in scan_data:
-                    if str(row["id"]) == str(effective_dropdown_single):
-                        row["X"] = target_coord[0]
-                        row["Y"] = target_coord[1]
-                        break
+                moves = [
+                    ("Greifer öffnen", lambda: self.qarm.gripper(cmd=0)),
+                    (f"Zu Objekt {effective_dropdown_single}", lambda: self.qarm.go_to(coord_a)),
+                    (GRAB_STEP, lambda: self.qarm.gripper(cmd=1)),
+                    ("Über Zielposition", lambda: self.qarm.go_to(target_coord_0)),
+                    ("Absenken", lambda: self.qarm.go_to(target_coord)),
+                    (RELEASE_STEP, lambda: self.qarm.gripper(cmd=0)),
+                    ("Home-Position", lambda: self.qarm.go_to("home"))
+                ]
                 status_msg = f"Platzierung von Objekt {effective_dropdown_single} zu Koordinaten X={effective_x}, Y={effective_y} durchgeführt."
-                return scan_data, status_msg, no_update
+                job = self.job_runner.start("place", self._place_job, moves, scan_ref, effective_dropdown_single, coord_a, target_coord, status_msg)
 
             else:
-                return no_update, no_update, no_update
+                return no_update, no_update
+
+            if job is None:
+                return message("Es läuft bereits eine Aufgabe des Roboters.")
+            return {"job_id": job.id, "kind": "place", "message": None}, False
+
+
+        # --------------------------------- FORTSCHRITT DER HINTERGRUNDAUFGABE -----------------------------------
+        @self.app.callback(
+            [
+            Output("scan-df-store", "data"),
+            Output("placement-status", "children"),
+            Output("scan-action-status", "children"),
+            Output("scan-job-progress", "value"),
+            Output("scan-job-progress", "style"),
+            Output("scan-job-progress-text", "children"),
+            Output("scan-job-interval", "disabled"),
+            Output("btn-cancel-job", "disabled")
+            ],
+            [
+            Input("scan-job-interval", "n_intervals"),
+            Input("scan-job-store", "data")
+            ]
+        )
+        def poll_job(n_intervals, job_info):
+            """
+            Fragt den Zustand der Hintergrundaufgabe ab und zeigt Fortschritt bzw. Ergebnis an.
+
+            Args:
+                n_intervals (int): Zähler des Abfrage-Intervalls.
+                job_info (dict): {"job_id", "kind", "message"} aus combined_callback.
+
+            Returns:
+                Tuple: Scan-Referenz, Pick-&-Place-Status, Scan-Status, Fortschritt (Wert, Stil, Text),
+                       Zustand des Intervalls und des Abbrechen-Buttons.
+            """
+            hidden = {"width": "100%", "marginTop": "10px", "display": "none"}
+            visible = {"width": "100%", "marginTop": "10px"}
+            if not job_info:
+                return no_update, no_update, no_update, 0, hidden, "", True, True
+            if job_info.get("job_id") is None:
+                # nur eine Meldung (z.B. fehlende Eingabe), keine Aufgabe gestartet
+                return no_update, job_info.get("message"), no_update, 0, hidden, "", True, True
+
+            job = self.job_runner.get(job_info["job_id"])
+            if job is None:
+                return no_update, no_update, no_update, 0, hidden, "", True, True
+            state = job.snapshot()
+            progress = state["progress"]
+
+            if state["status"] == "running":
+                if state["kind"] == "scan":
+                    value = 100 * progress.get("stop", 0) / progress.get("stops", 1)
+                    text = (f"Scan: Halt {progress.get('stop', 0)}/{progress.get('stops', '-')}, "
+                            f"Winkel {progress.get('angle', '-')}°, {progress.get('detections', 0)} Detektionen, "
+                            f"{state['elapsed']:.0f} s ({progress.get('stage', '')})")
+                else:
+                    value = 100 * progress.get("step", 0) / progress.get("steps", 1)
+                    text = (f"Pick & Place: Schritt {progress.get('step', 0)}/{progress.get('steps', '-')} "
+                            f"({progress.get('label', '')}), {state['elapsed']:.0f} s")
+                if job.cancelled:
+                    text += " - wird abgebrochen ..."
+                return no_update, no_update, no_update, value, visible, text, False, job.cancelled
+
+            # Aufgabe beendet --> Ergebnis übernehmen und Abfrage stoppen
+            finished = (0, hidden, f"Dauer: {state['elapsed']:.0f} s", True, True)
+            if state["status"] == "cancelled":
+                if state["kind"] == "scan":
+                    message = "Scan abgebrochen, Roboter in Home-Position."
+                else:
+                    message = "Pick & Place abgebrochen (gegriffene Objekte wurden zurückgelegt), Roboter in Home-Position."
+                return (no_update, message, no_update) + finished
+            if state["status"] == "failed":
+                return (no_update, f"Fehler: {state['error']}", no_update) + finished
+            if state["kind"] == "scan":
+                if job.result is None:
+                    return (None, "Keine Objekte erkannt.", no_update) + finished
+                return (job.result, "", "Scan abgeschlossen!") + finished
+            new_ref, status_msg = job.result
+            return (new_ref, status_msg, no_update) + finished
+
+
+        @self.app.callback(
+            Output("btn-cancel-job", "disabled", allow_duplicate=True),
+            Input("btn-cancel-job", "n_clicks"),
+            State("scan-job-store", "data"),
+            prevent_initial_call=True
+        )
+        def cancel_job(n_clicks, job_info):
+            """Fordert den Abbruch der laufenden Aufgabe an (wirksam vor der nächsten Bewegung)."""
+            if not n_clicks or not job_info or job_info.get("job_id") is None:
+                return no_update
+            self.job_runner.cancel(job_info["job_id"])
+            return True
 
 
 
@@ -3,6 +3,7 @@ from email.message import EmailMessage
 import os, base64, shutil, time, cv2, smtplib
 import dash_bootstrap_components as dbc
 from dash import dcc, html, callback_context, Output, Input, State, dash_table, no_update
+from yolo_model import model_registry
 
 class YoloModel:
     """
@@ -231,12 +232,15 @@ class YoloModel:
         # ------------------------------
         # Callback 1: Freischaltung des Datensatz-Generierungsbereichs
         @self.app.callback(
-            Output("hidden-content", "style"),
+            [Output("hidden-content", "style"),
+             Output("dataset-status", "children")],
             [Input("btn-generate-dataset", "n_clicks")],
             [State("btn-generate-dataset", "disabled")]
         )
         def show_hidden_content(n_clicks, disabled):
             if n_clicks and not disabled:
+                if self.qarm.is_busy():
+                    return {"display": "none"}, "Roboter ist beschäftigt (Scan oder Pick & Place läuft)."
                 # Leere Ordner "New_imgs/makro" und "New_imgs/mikro"
                 for directory in ["New_imgs/makro", "New_imgs/mikro"]:
                     if os.path.exists(directory):
@@ -246,9 +250,9 @@ class YoloModel:
                                 os.unlink(fpath)
                             elif os.path.isdir(fpath):
                                 shutil.rmtree(fpath)
-                self.qarm.go_to((0.3, 0.001, 0.175)) # Fahre Roboter in Makroposition
-                return {"display": "block"} # Sichtbar machen
-            return {"display": "none"}
+                self.qarm.go_to_async((0.3, 0.001, 0.175)) # Fahre Roboter in Makroposition
+                return {"display": "block"}, "" # Sichtbar machen
+            return {"display": "none"}, ""
 
         # ------------------------------
         # Callback 2: Aktualisiere verfügbare YOLO-Modell-Liste (alle 2s)
@@ -265,11 +269,17 @@ class YoloModel:
                 if model_files:
                     items = []
                     for f in model_files:
+                        # gemessene Inferenzzeit (PyTorch) aus der Modell-Registry
+                        latency = model_registry.get_latency(os.path.join(self.yolo_model_dir, f))
+                        timing = html.Span(
+                            f" (p50 {latency['p50']:.0f} ms / p95 {latency['p95']:.0f} ms)" if latency else " (nicht gemessen)",
+                            style={"color": "gray"}
+                        )
                         # aktuelles Modell in grüner Schrift
                         if f == self.current_yolo_model:
-                            items.append(html.Li(html.Span(f, style={"color": "green"})))
+                            items.append(html.Li([html.Span(f, style={"color": "green"}), timing]))
                         else:
-                            items.append(html.Li(f))
+                            items.append(html.Li([f, timing]))
                     return html.Ul(items)
                 else:
                     return "Keine Modelle gefunden."
@@ -293,7 +303,9 @@ class YoloModel:
                 try:
                     with open(filepath, "wb") as f:
                         f.write(decoded)
-                    return f"Modell {upload_filename} erfolgreich hochgeladen."
+                    # Einmaliger ONNX-Export im Hintergrund (CPU-optimierte Inferenz, wählbar in der Navbar)
+                    model_registry.export_async(filepath, "onnx", retry=True)
+                    return f"Modell {upload_filename} erfolgreich hochgeladen. ONNX-Export wird im Hintergrund erstellt."
                 except Exception as e:
                     return f"Fehler beim Speichern: {str(e)}"
             return ""
@@ -411,8 +423,10 @@ class YoloModel:
             # Mikroposition anfahren
             if triggered_id == "btn-move-to-micro":
                 micro_coord = (0.3, 0.001, 0.01) # getestet
-                self.qarm.go_to(micro_coord)
-                return "Roboter in Mikroposition gefahren.", current_value or 0
+                if self.qarm.is_busy():
+                    return "Roboter ist beschäftigt (Scan oder Pick & Place läuft).", current_value or 0
+                self.qarm.go_to_async(micro_coord)
+                return "Roboter fährt in Mikroposition.", current_value or 0
 
             # Fotos aufnehmen
             elif triggered_id == "btn-capture-micro":
@@ -447,7 +461,8 @@ class YoloModel:
         )
         def home_and_download(n_clicks, recipient_email):
             if n_clicks:
-                self.qarm.go_to("home")
+                if not self.qarm.is_busy():
+                    self.qarm.go_to_async("home") # ZIP wird parallel zur Fahrt erstellt
                 timestamp = datetime.now().strftime("%H-%M--%d-%m-%Y")
                 zip_basename = os.path.join("New_zips", f"zip_{timestamp}")
                 shutil.make_archive(zip_basename, 'zip', "New_imgs")
@@ -1,7 +1,389 @@
-import os
+import os, threading, time
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
 from ultralytics import YOLO
 from dash import Input, Output, State
 
+# Inferenz-Backends: Name -> (Anzeigename, Exportformat für ultralytics, Zusatzargumente, Suffix des Exportartefakts)
+# Die exportierten Artefakte werden neben der .pt-Datei abgelegt (z.B. YOLO_Modelle/best.onnx).
+BACKENDS = OrderedDict([
+    ("pytorch", ("PyTorch", None, {}, ".pt")),
+    ("onnx", ("ONNX Runtime", "onnx", {}, ".onnx")),
+    ("openvino", ("OpenVINO", "openvino", {}, "_openvino_model")),
+    ("openvino_int8", ("OpenVINO INT8", "openvino", {"int8": True}, "_int8_openvino_model")),
+])
+
+
+def exported_model_path(pt_path, backend):
+    """
+    Liefert den Pfad des Exportartefakts einer .pt-Datei für das angegebene Backend.
+
+    Args:
+        pt_path (str): Pfad zur .pt-Datei.
+        backend (str): Schlüssel aus BACKENDS.
+
+    Returns:
+        str: Pfad zur Datei bzw. zum Ordner des exportierten Modells.
+    """
+    if backend == "pytorch":
+        return pt_path
+    return os.path.splitext(pt_path)[0] + BACKENDS[backend][3]
+
+
+def is_exported(pt_path, backend):
+    """
+    Prüft, ob ein aktuelles Exportartefakt existiert (nicht älter als die .pt-Datei).
+
+    Args:
+        pt_path (str): Pfad zur .pt-Datei.
+        backend (str): Schlüssel aus BACKENDS.
+
+    Returns:
+        bool: True, wenn das Backend ohne Export genutzt werden kann.
+    """
+    artifact = exported_model_path(pt_path, backend)
+    try:
+        return os.path.getmtime(artifact) >= os.path.getmtime(pt_path)
+    except OSError:
+        return False
+
+class YOLOModelRegistry:
+    """
+    Prozessweiter Zwischenspeicher für geladene YOLO-Modelle.
+
+    Funktionen:
+    - Lädt jede Modelldatei nur einmal; Schlüssel ist der absolute Pfad zusammen mit dem Änderungszeitpunkt,
+      sodass eine neu hochgeladene Datei mit gleichem Namen automatisch neu geladen wird.
+    - Hält höchstens `max_models` Modelle im Speicher (zuletzt genutzte bleiben erhalten, LRU).
+    - Exportiert .pt-Dateien einmalig im Hintergrund in CPU-optimierte Formate (ONNX, OpenVINO)
+      und misst die Inferenzzeit je Modell und Backend.
+    - Wärmt neu gewählte Modelle im Hintergrund auf, damit die erste echte Detektion nicht die Initialisierung bezahlt.
+    - Export und Latenzmessung laden eigene, nicht zwischengespeicherte Instanzen, damit sie die von Kamera und
+      Controller genutzten Modelle nicht aus dem LRU verdrängen.
+    - Latenzmessungen laufen nur, solange kein Scan aktiv ist (scan_active()), damit sie weder die Detektionen
+      des Scans verlangsamen noch durch sie verfälscht werden.
+    - Wird von YOLOModelController, Camera und ScanManager gemeinsam genutzt.
+    """
+    def __init__(self, max_models=2):
+        """
+        Initialisiert die Registry.
+
+        Args:
+            max_models (int): Maximale Anzahl gleichzeitig geladener Modelle.
+        """
+        self.max_models = max_models
+        self.models = OrderedDict()
+        self.loading = {}        # model_key -> threading.Event, solange die Datei geladen wird
+        self.lock = threading.Lock()
+        self.inference_lock = threading.Lock() # YOLO-Instanzen sind nicht threadsicher --> Inferenz serialisieren
+        self.jobs = set()        # laufende Hintergrundaufgaben (Export/Messung) als (Art, Pfad, Backend)
+        self.latencies = {}      # (absoluter .pt-Pfad, mtime, Backend) -> {"p50": ms, "p95": ms}
+        self.warmed = set()      # Schlüssel (model_key) bereits aufgewärmter Modellinstanzen
+        self.failed_exports = set() # (absoluter .pt-Pfad, mtime, Backend) --> nicht automatisch erneut versuchen
+        self.scan_condition = threading.Condition() # signalisiert das Ende laufender Scans
+        self.active_scans = 0
+        self.scan_generation = 0 # zählt gestartete Scans --> erkennt Scans während einer Messung
+
+    @staticmethod
+    def model_key(model_path):
+        """
+        Bildet den Schlüssel eines Modells aus absolutem Pfad und Änderungszeitpunkt.
+
+        Args:
+            model_path (str): Pfad zur .pt-Datei.
+
+        Returns:
+            tuple: (absoluter Pfad, mtime) – mtime ist None, falls die Datei nicht existiert.
+        """
+        abs_path = os.path.abspath(model_path)
+        try:
+            mtime = os.path.getmtime(abs_path)
+        except OSError:
+            mtime = None
+        return abs_path, mtime
+
+    def get(self, model_path, backend="pytorch"):
+        """
+        Liefert das Modell zur angegebenen Datei und lädt es nur, wenn es noch nicht (oder veraltet) im Speicher liegt.
+        Ist für das gewünschte Backend noch kein Export vorhanden, wird dieser im Hintergrund gestartet und
+        bis dahin das PyTorch-Modell verwendet.
+
+        Args:
+            model_path (str): Pfad zur .pt-Datei.
+            backend (str): Schlüssel aus BACKENDS (Standard: "pytorch").
+
+        Returns:
+            YOLO: Geladene Modellinstanz.
+        """
+        return self._load(self.resolve(model_path, backend))
+
+    def resolve(self, model_path, backend="pytorch"):
+        """
+        Bestimmt die tatsächlich zu ladende Datei für Modell und Backend.
+
+        Args:
+            model_path (str): Pfad zur .pt-Datei.
+            backend (str): Schlüssel aus BACKENDS.
+
+        Returns:
+            str: Pfad des Exportartefakts oder der .pt-Datei (Fallback, solange nicht exportiert).
+        """
+        if backend not in BACKENDS or backend == "pytorch":
+            return model_path
+        if is_exported(model_path, backend):
+            return exported_model_path(model_path, backend)
+        self.export_async(model_path, backend)
+        return model_path
+
+    def _load(self, model_path):
+        """
+        Lädt eine Modelldatei über den LRU-Zwischenspeicher.
+        Das Laden von der Festplatte (mehrere Sekunden) läuft außerhalb der Registry-Sperre, damit Abfragen
+        wie get_latency() oder is_busy() nicht warten; gleichzeitige Anfragen derselben Datei warten auf
+        das Ladeereignis des ersten Aufrufers, statt sie ein zweites Mal zu laden.
+        """
+        key = self.model_key(model_path)
+        while True:
+            with self.lock:
+                if key in self.models:
+                    self.models.move_to_end(key)
+                    return self.models[key]
+                loading = self.loading.get(key)
+                if loading is None:
+                    loading = self.loading[key] = threading.Event()
+                    break
+            loading.wait() # anderer Thread lädt dieselbe Datei --> danach erneut im LRU nachsehen
+
+        try:
+            model = self._create(model_path)
+            with self.lock:
+                # Veraltete Versionen derselben Datei verwerfen
+                for old_key in [k for k in self.models if k[0] == key[0]]:
+                    del self.models[old_key]
+                    self.warmed.discard(old_key)
+
+                self.models[key] = model
+                while len(self.models) > self.max_models:
+                    evicted_key, _ = self.models.popitem(last=False)
+                    self.warmed.discard(evicted_key)
+        finally:
+            with self.lock:
+                del self.loading[key]
+            loading.set()
+        print(f"[INFO] YOLO-Modell geladen: {os.path.basename(model_path)}")
+        return model
+
+    @staticmethod
+    def _create(model_path):
+        """Lädt eine Modelldatei ohne Zwischenspeicher (z.B. für Messungen im Hintergrund)."""
+        # Exportierte Formate enthalten keine Aufgabeninformation --> explizit "detect"
+        return YOLO(model_path) if model_path.endswith(".pt") else YOLO(model_path, task="detect")
+
+    def _run_job(self, job, target):
+        """Führt `target` einmalig in einem Hintergrund-Thread aus (gleiche Aufgaben werden nicht doppelt gestartet)."""
+        with self.lock:
+            if job in self.jobs:
+                return
+            self.jobs.add(job)
+
+        def run():
+            try:
+                target()
+            except Exception as e:
+                print(f"[FEHLER] Hintergrundaufgabe {job[0]} für '{os.path.basename(job[1])}' ({job[2]}) fehlgeschlagen: {e}")
+            finally:
+                with self.lock:
+                    self.jobs.discard(job)
+        threading.Thread(target=run, name=f"yolo-{job[0]}", daemon=True).start()
+
+    def export(self, model_path, backend):
+        """
+        Exportiert eine .pt-Datei in das Format des Backends (blockierend) und misst anschließend die Inferenzzeit.
+
+        Args:
+            model_path (str): Pfad zur .pt-Datei.
+            backend (str): Schlüssel aus BACKENDS.
+
+        Returns:
+            str: Pfad des Exportartefakts.
+        """
+        if backend == "pytorch" or is_exported(model_path, backend):
+            return exported_model_path(model_path, backend)
+        _, export_format, export_args, _ = BACKENDS[backend]
+        print(f"[INFO] Exportiere {os.path.basename(model_path)} nach {BACKENDS[backend][0]}...")
+        try:
+            YOLO(model_path).export(format=export_format, **export_args)
+        except Exception:
+            with self.lock:
+                self.failed_exports.add(self.model_key(model_path) + (backend,))
+            raise
+        self.measure_latency(model_path, backend)
+        return exported_model_path(model_path, backend)
+
+    def export_async(self, model_path, backend, retry=False):
+        """
+        Startet export() im Hintergrund (z.B. direkt nach dem Upload eines Modells).
+        Fehlgeschlagene Exporte derselben Datei werden nur mit `retry=True` erneut gestartet.
+        """
+        with self.lock:
+            failed_key = self.model_key(model_path) + (backend,)
+            if failed_key in self.failed_exports:
+                if not retry:
+                    return
+                self.failed_exports.discard(failed_key)
+        self._run_job(("export", os.path.abspath(model_path), backend), lambda: self.export(model_path, backend))
+
+    def is_busy(self, model_path, backend):
+        """Gibt an, ob für Modell und Backend gerade ein Export läuft."""
+        with self.lock:
+            return ("export", os.path.abspath(model_path), backend) in self.jobs
+
+    def export_failed(self, model_path, backend):
+        """Gibt an, ob der Export der aktuellen Datei für das Backend fehlgeschlagen ist."""
+        with self.lock:
+            return self.model_key(model_path) + (backend,) in self.failed_exports
+
+    @contextmanager
+    def scan_active(self):
+        """Markiert einen laufenden Scan (with-Block); Latenzmessungen warten bis zu dessen Ende."""
+        with self.scan_condition:
+            self.active_scans += 1
+            self.scan_generation += 1
+        try:
+            yield
+        finally:
+            with self.scan_condition:
+                self.active_scans -= 1
+                self.scan_condition.notify_all()
+
+    def _wait_for_idle(self):
+        """
+        Wartet, bis kein Scan mehr läuft.
+
+        Returns:
+            int: Aktueller Scan-Zähler (zum Erkennen eines zwischenzeitlich gestarteten Scans).
+        """
+        with self.scan_condition:
+            self.scan_condition.wait_for(lambda: self.active_scans == 0)
+            return self.scan_generation
+
+    def measure_latency(self, model_path, backend="pytorch", runs=20, warmup_runs=3):
+        """
+        Misst die Inferenzzeit (p50/p95) auf einem leeren 1280x720-Bild nach einigen Aufwärmdurchläufen.
+        Gemessen wird eine eigene Instanz außerhalb des LRU: die aktiven Modelle werden weder verdrängt
+        noch durch die Messung blockiert (keine gemeinsame Inferenzsperre). Die Messung startet erst, wenn kein
+        Scan läuft, und wird wiederholt, falls währenddessen ein Scan begonnen hat.
+
+        Args:
+            model_path (str): Pfad zur .pt-Datei.
+            backend (str): Schlüssel aus BACKENDS.
+            runs (int): Anzahl der gemessenen Durchläufe.
+            warmup_runs (int): Anzahl der vorgeschalteten, nicht gemessenen Durchläufe.
+
+        Returns:
+            dict | None: {"p50": ms, "p95": ms} (None, solange das Backend nicht exportiert ist).
+        """
+        if backend != "pytorch" and not is_exported(model_path, backend):
+            return None
+        self._wait_for_idle()
+        model = self._create(exported_model_path(model_path, backend))
+        dummy = np.zeros((720, 1280, 3), dtype=np.uint8)
+        for _ in range(warmup_runs):
+            model(dummy, verbose=False)
+
+        while True:
+            generation = self._wait_for_idle()
+            durations = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                model(dummy, verbose=False)
+                durations.append(1000 * (time.perf_counter() - start))
+            with self.scan_condition:
+                if self.active_scans == 0 and self.scan_generation == generation:
+                    break
+            print(f"[INFO] Scan während der Latenzmessung von {os.path.basename(model_path)} ({backend}) --> Messung wird wiederholt.")
+        latency = {"p50": float(np.percentile(durations, 50)), "p95": float(np.percentile(durations, 95))}
+        with self.lock:
+            self.latencies[self.model_key(model_path) + (backend,)] = latency
+        print(f"[INFO] Inferenzzeit {os.path.basename(model_path)} ({backend}): "
+              f"p50 {latency['p50']:.0f} ms, p95 {latency['p95']:.0f} ms")
+        return latency
+
+    def measure_latency_async(self, model_path, backend="pytorch"):
+        """Startet measure_latency() im Hintergrund, sofern noch kein Messwert vorliegt."""
+        with self.lock:
+            if self.model_key(model_path) + (backend,) in self.latencies:
+                return
+        self._run_job(("latency", os.path.abspath(model_path), backend), lambda: self.measure_latency(model_path, backend))
+
+    def warm_up(self, model_path, backend="pytorch", runs=3):
+        """
+        Wärmt die im LRU liegende Instanz für Modell und Backend auf (blockierend, unter der Inferenzsperre).
+        Solange der Export läuft, wird das PyTorch-Modell aufgewärmt. Bereits aufgewärmte Instanzen werden übersprungen.
+
+        Args:
+            model_path (str): Pfad zur .pt-Datei.
+            backend (str): Gewünschtes Backend (Schlüssel aus BACKENDS).
+            runs (int): Anzahl der Aufwärmdurchläufe.
+        """
+        artifact = self.resolve(model_path, backend)
+        key = self.model_key(artifact)
+        with self.lock:
+            if key in self.warmed:
+                return
+        model = self._load(artifact)
+        dummy = np.zeros((720, 1280, 3), dtype=np.uint8)
+        with self.inference_lock:
+            for _ in range(runs):
+                model(dummy, verbose=False)
+        with self.lock:
+            if self.models.get(key) is model:
+                self.warmed.add(key)
+
+    def warm_up_async(self, model_path, backend="pytorch"):
+        """
+        Startet warm_up() im Hintergrund (Aufruf beim Modellwechsel) und anschließend die Latenzmessung,
+        falls für Modell und Backend noch kein Messwert vorliegt.
+
+        Args:
+            model_path (str): Pfad zur .pt-Datei.
+            backend (str): Gewünschtes Backend (Schlüssel aus BACKENDS).
+        """
+        if backend not in BACKENDS or (backend != "pytorch" and not is_exported(model_path, backend)):
+            backend = "pytorch"
+        self._run_job(("warmup", os.path.abspath(model_path), backend), lambda: self.warm_up(model_path, backend))
+        self.measure_latency_async(model_path, backend)
+
+    def get_latency(self, model_path, backend="pytorch"):
+        """
+        Liefert die gemessene Inferenzzeit für Modell und Backend.
+
+        Returns:
+            dict | None: {"p50": ms, "p95": ms} oder None, falls (noch) nicht gemessen.
+        """
+        with self.lock:
+            return self.latencies.get(self.model_key(model_path) + (backend,))
+
+    def is_current(self, model_path, model):
+        """
+        Prüft, ob `model` der aktuelle Stand der Datei `model_path` ist (ohne zu laden).
+
+        Args:
+            model_path (str): Pfad zur .pt-Datei.
+            model (YOLO): Zu prüfende Modellinstanz.
+
+        Returns:
+            bool: True, wenn das Modell unverändert zur Datei passt.
+        """
+        with self.lock:
+            return self.models.get(self.model_key(model_path)) is model
+
+
+# Gemeinsame Instanz für die gesamte Anwendung
+model_registry = YOLOModelRegistry()
+
+
 class YOLOModelController:
     """
     Diese Klasse verwaltet die YOLO-Modellverwaltung innerhalb der Dash-Applikation.
@@ -13,6 +395,7 @@ class YOLOModelController:
 
     Attribute:
         current_model_path: Pfad des aktuell geladenen YOLO-Modells.
+        current_backend: Gewähltes Inferenz-Backend (Schlüssel aus BACKENDS).
         model: Instanz des geladenen YOLO-Modells.
     """
 
@@ -25,7 +408,9 @@ class YOLOModelController:
             default_model_path: Pfad zum Standardmodell (Default: YOLOv11_default.pt).
         """
         self.current_model_path = default_model_path
-        self.model = YOLO(self.current_model_path)
+        self.current_backend = "pytorch"
+        self.current_resolved_path = self.current_model_path # tatsächlich geladene Datei (.pt oder Exportartefakt)
+        self.model = model_registry.get(self.current_model_path)
         self.register_callbacks(app)
 
     def get_current_model_name(self):
@@ -37,19 +422,27 @@ class YOLOModelController:
         """
         return os.path.basename(self.current_model_path)
     
-    def load_model(self, new_model_path):
+    def load_model(self, new_model_path, backend=None):
         """
         Lädt ein neues YOLO-Modell aus dem angegebenen Pfad.
 
         Args:
             new_model_path (str): Pfad zur neuen YOLO-Modell-Datei.
+            backend (str, optional): Inferenz-Backend (Standard: aktuell gewähltes Backend).
 
         Returns:
             str: Name des neu geladenen Modells.
         """
-        if new_model_path != self.current_model_path:
-            self.model = YOLO(new_model_path)
+        backend = backend or self.current_backend
+        # auch neu laden, wenn der Export eines Backends inzwischen fertig ist (Fallback .pt --> Exportartefakt)
+        resolved_path = model_registry.resolve(new_model_path, backend)
+        if (new_model_path != self.current_model_path or backend != self.current_backend
+                or resolved_path != self.current_resolved_path):
+            self.model = model_registry.get(new_model_path, backend)
             self.current_model_path = new_model_path
+            self.current_backend = backend
+            self.current_resolved_path = resolved_path
+            model_registry.warm_up_async(new_model_path, backend)
             return self.get_current_model_name()
 
     def get_model(self):
@@ -86,7 +479,9 @@ class YOLOModelController:
                 tuple: (Liste der Modelloptionen, aktuell gewähltes Modell).
             """
             path = os.path.join(os.getcwd(), "YOLO_Modelle")
-            options = [{"label": f, "value": f} for f in sorted(os.listdir(path))] if os.path.exists(path) else [{"label": "Kein YOLO Modell gefunden", "value": None}]
+            # nur .pt-Dateien anzeigen (Exportartefakte liegen im selben Ordner)
+            model_files = sorted(f for f in os.listdir(path) if f.endswith(".pt")) if os.path.exists(path) else []
+            options = [{"label": f, "value": f} for f in model_files] if model_files else [{"label": "Kein YOLO Modell gefunden", "value": None}]
 
             current_loaded = self.get_current_model_name()
 
@@ -95,3 +490,49 @@ class YOLOModelController:
                 return options, current_value
 
             return options, current_loaded
+
+        @app.callback(
+            [Output("yolo-backend-dropdown", "options"),
+             Output("yolo-backend-dropdown", "value")],
+            [Input("update-setting-icons", "n_intervals"),
+             Input("yolo-dropdown", "value"),
+             Input("yolo-backend-dropdown", "value")]
+        )
+        def update_backend_dropdown(n_intervals, model_name, backend):
+            """
+            Aktualisiert die Backend-Auswahl (PyTorch/ONNX/OpenVINO) für das gewählte Modell inkl. gemessener Inferenzzeit.
+
+            Args:
+                n_intervals (int): Zeitintervall-Trigger.
+                model_name (str): Aktuell gewähltes Modell.
+                backend (str): Aktuell gewähltes Backend.
+
+            Returns:
+                tuple: (Liste der Backend-Optionen, gewähltes Backend).
+            """
+            backend = backend if backend in BACKENDS else self.current_backend
+            if not model_name:
+                return [{"label": BACKENDS[backend][0], "value": backend}], backend
+            model_path = f"YOLO_Modelle/{model_name}"
+
+            # Bei Wechsel oder nach abgeschlossenem Export das gewählte Backend laden
+            self.load_model(model_path, backend)
+
+            options = []
+            for key, (label, _, _, _) in BACKENDS.items():
+                if key != "pytorch" and not is_exported(model_path, key):
+                    if model_registry.is_busy(model_path, key):
+                        status = "wird exportiert..."
+                    elif model_registry.export_failed(model_path, key):
+                        status = "Export fehlgeschlagen"
+                    else:
+                        status = "nicht exportiert"
+                else:
+                    latency = model_registry.get_latency(model_path, key)
+                    if latency is None:
+                        model_registry.measure_latency_async(model_path, key)
+                        status = "Messung läuft..."
+                    else:
+                        status = f"p50 {latency['p50']:.0f} ms"
+                options.append({"label": f"{label} ({status})", "value": key})
+            return options, backend